@@ -0,0 +1,25 @@
+working_dir = 'models/complex/compile_scaling'
+cache_dir = 'cache'
+
+# How often every protocol is compiled
+averaging_factor = 5
+# Measure the duration of the single compilation phases with a compile server,
+# in addition to the compilations in fresh JVMs
+collect_phases = True
+
+# Every dimension is scaled on its own, while the others keep these values
+base_parameters = {
+        'participants': 2,
+        'methods': 2,
+        'depth': 1,
+        'branching_width': 0,
+        'releases': 0
+    }
+
+sweeps = {
+        'participants': [1, 2, 4, 8, 16, 32, 64],
+        'methods': [1, 2, 4, 8, 16, 32, 64, 128],
+        'depth': [0, 1, 2, 4, 8, 16],
+        'branching_width': [0, 2, 4, 8, 16, 32],
+        'releases': [0, 1, 2, 4]
+    }
@@ -1,8 +1,56 @@
+import os
+import random
+from evaluation_lib.render_template import renderTemplate
+
 working_dir = 'models/complex/consecutive_calls'
 cache_dir = 'cache'
 
-averaging_factor = 10
-intervals = [1, 2, 3, 4, 5, 10, 30, 50, 70, 80, 100, 300, 500, 700, 900]
+type_template_file = 'model.template.st'
+type_target_file = 'model.st'
+model_template_file = 'model.template.abs'
+model_target_file = 'model.abs'
 
 def genMethod(ident: int):
     return 'm{0}'.format(ident)
+
+def renderModel(parameters: dict, target_dir: str):
+    methodNames = list(
+            map(
+                genMethod,
+                range(0, parameters['num_methods'])
+            )
+        )
+
+    indirection_methods = []
+    if parameters['use_indirection']:
+        indirection_methods = methodNames[1::2]
+
+    renderTemplate(
+            type_template_file,
+            os.path.join(target_dir, type_target_file),
+            {
+                'times': parameters['times'],
+                'methods': methodNames,
+                'indirection_methods': indirection_methods,
+                'busywait_factor': parameters['busywait_factor'],
+                'use_await': parameters['use_await']
+            }
+        )
+
+    if parameters['reverse_methods']:
+        methodNames = list(reversed(methodNames))
+
+    if parameters['shuffle_methods']:
+        random.shuffle(methodNames)
+
+    renderTemplate(
+            model_template_file,
+            os.path.join(target_dir, model_target_file),
+            {
+                'times': parameters['times'],
+                'methods': methodNames,
+                'indirection_methods': indirection_methods,
+                'busywait_factor': parameters['busywait_factor'],
+                'use_await': parameters['use_await']
+            }
+        )
@@ -1,5 +1,2 @@
 working_dir = 'models/complex/notification_service'
 cache_dir = 'cache'
-
-averaging_factor = 10
-intervals = [1, 2, 3, 4, 5, 10, 30, 50, 70, 80, 100, 300, 500, 700, 900]
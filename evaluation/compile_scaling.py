@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import subprocess
+from evaluation_lib.compile import build_dir, isCompiled, checkCompiled
+from evaluation_lib.environment import environmentMetadata, volatileMetadata, checkEnvironment
+from evaluation_lib.evaluate import runMeasured, availableCores
+from evaluation_lib.compile_server import sdstool_path, startCompileServer, compileRemote, default_port
+from evaluation_lib.protocol_generator import generateProtocol, globalType, protocolSize
+from evaluation_lib.render_template import renderTemplate
+from evaluation_lib.results_store import resultsPath, measureCell
+from evaluation_lib.warm_run import erlangModule
+from evaluation_lib.workspace import createWorkspace, removeWorkspace
+
+from common_compile_scaling import *
+
+os.chdir(working_dir)
+
+model_module = 'Protocol'
+model_template_file = 'Protocol.template.abs'
+model_target_file = 'Protocol.abs'
+type_target_file = 'Protocol.st'
+
+def buildProtocol(parameters: dict, target_dir: str) -> dict:
+    protocol = generateProtocol(**parameters)
+
+    renderTemplate(
+            model_template_file,
+            os.path.join(target_dir, model_target_file),
+            protocol
+        )
+
+    with open(os.path.join(target_dir, type_target_file), 'w') as type_file:
+        type_file.write(globalType(protocol))
+
+    return protocol
+
+def generatedErlangSize(build_dir: str) -> int:
+    """
+    Size of the Erlang sources generated for the model, without the ABS runtime
+    and standard library, which are copied into every build.
+    """
+    prefixes = (erlangModule(model_module), 'class_{}_'.format(model_module.replace('.', '_')))
+
+    return sum(
+            os.path.getsize(os.path.join(dirpath, filename))
+            for dirpath, _, filenames in os.walk(os.path.join(build_dir, 'gen/erl'))
+            for filename in filenames
+            if filename.endswith('.erl') and filename.startswith(prefixes)
+        )
+
+def checkSweeps():
+    """
+    Makes sure that every sweep actually grows the protocol and that the SDS-tool
+    accepts its smallest and largest protocol, before hours are spent on
+    measuring them.
+    """
+    for dimension, values in sweeps.items():
+        sizes = [
+                sum(protocolSize(generateProtocol(**{**base_parameters, dimension: value})).values())
+                for value in values
+            ]
+        if any(smaller >= larger for smaller, larger in zip(sizes, sizes[1:])):
+            raise ValueError('The protocol does not grow with {} over {}, its sizes are {}.'.format(dimension, values, sizes))
+
+        for value in [min(values), max(values)]:
+            workspace = createWorkspace('check-{}-{}'.format(dimension, value))
+            buildProtocol({**base_parameters, dimension: value}, workspace)
+            compilation = subprocess.run(
+                    [sdstool_path, 'compile', model_target_file, type_target_file],
+                    cwd=workspace,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT
+                )
+            compiled = isCompiled(workspace)
+            removeWorkspace(workspace)
+            if not compiled:
+                raise RuntimeError('The SDS-tool rejected the protocol with {} = {}:\n{}'.format(dimension, value, compilation.stdout.decode()))
+
+def measureCompilation(dimension: str, value: int):
+    parameters = {**base_parameters, dimension: value}
+    workspace = createWorkspace('{}-{}'.format(dimension, value))
+    protocol = buildProtocol(parameters, workspace)
+
+    rows = []
+    for repetition in range(0, averaging_factor):
+        # Every repetition compiles from scratch, so that a rejected protocol can
+        # not pass for compiled because of the build of an earlier repetition
+        shutil.rmtree(os.path.join(workspace, build_dir), ignore_errors=True)
+        measurement = runMeasured(sdstool_path, 'compile', model_target_file, type_target_file, working_dir=workspace)
+        checkCompiled(workspace, measurement.stdout)
+
+        row = {
+            'config': dimension,
+            'times': value,
+            'variant': 'compile',
+            'repetition': repetition,
+            'real': measurement.real,
+            'user': measurement.user,
+            'sys': measurement.sys,
+            'maximum_rss': measurement.maximum_rss,
+            'exit_code': measurement.exit_code,
+            'erlang_bytes': generatedErlangSize(workspace)
+        }
+        row.update(parameters)
+        row.update(protocolSize(protocol))
+
+        if collect_phases:
+            shutil.rmtree(os.path.join(workspace, build_dir), ignore_errors=True)
+            result = compileRemote([model_target_file, type_target_file], working_dir=workspace, port=default_port)
+            if not result.success:
+                raise RuntimeError('The compile server rejected the protocol with {} = {}:\n{}'.format(dimension, value, result.output))
+            checkCompiled(workspace, result.output)
+            row.update({
+                'phase_' + phase.replace(' ', '_'): millis / 1000
+                for phase, millis in result.phase_millis.items()
+            })
+
+        rows.append(row)
+
+    removeWorkspace(workspace)
+
+    return rows
+
+os.makedirs(cache_dir, exist_ok=True)
+
+metadata = environmentMetadata(availableCores())
+for warning in checkEnvironment(metadata):
+    print('Warning: {}'.format(warning))
+
+checkSweeps()
+
+server = startCompileServer() if collect_phases else None
+try:
+    for dimension, values in sweeps.items():
+        for value in values:
+            print('Compiling protocol with {} = {}'.format(dimension, value))
+            measureCell(
+                    resultsPath(cache_dir, dimension),
+                    value,
+                    'compile',
+                    lambda: measureCompilation(dimension, value),
+                    {**metadata, **volatileMetadata(availableCores())}
+                )
+finally:
+    if server is not None:
+        server.terminate()
+
+print('Saved results')
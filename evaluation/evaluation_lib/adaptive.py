@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import math
+from statistics import mean, variance
+from typing import Sequence, Optional, Tuple
+from evaluation_lib.evaluate import runMeasured, mapOnCores, aggregateMeasurements
+
+def normalQuantile(p: float) -> float:
+    # Inverts the standard normal CDF by bisection, which is precise enough for confidence levels
+    low, high = -10.0, 10.0
+    for i in range(0, 100):
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < p:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
+
+def relativeOverheadInterval(plain: Sequence[float], enforcement: Sequence[float], confidence: float) -> Tuple[float, float]:
+    """
+    Estimates the relative overhead mean(enforcement) / mean(plain) - 1 and the
+    half width of its confidence interval, using the delta method for the ratio
+    of two independent means.
+    """
+    plain_mean, enforcement_mean = mean(plain), mean(enforcement)
+    if plain_mean == 0 or enforcement_mean == 0:
+        return math.nan, math.inf
+
+    ratio = enforcement_mean / plain_mean
+    ratio_variance = ratio**2 * (
+            variance(enforcement) / (len(enforcement) * enforcement_mean**2) +
+            variance(plain) / (len(plain) * plain_mean**2)
+        )
+
+    return ratio - 1, normalQuantile(0.5 + confidence / 2) * math.sqrt(ratio_variance)
+
+def evaluateAdaptive(
+        plain_args: Sequence[str],
+        enforcement_args: Sequence[str],
+        relative_ci_target: float,
+        min_repetitions: int = 3,
+        max_repetitions: int = 100,
+        confidence: float = 0.95,
+        cores: Optional[Sequence[int]] = None,
+        perf_events: Optional[Sequence[str]] = None,
+        memory_sample_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[float] = None,
+        warmup_runs: int = 0
+):
+    """
+    Measures the plain and the enforced model alternately until the confidence
+    interval of the relative overhead in user time is narrower than
+    +-relative_ci_target (e.g. 0.02 for +-2 percentage points), or until
+    max_repetitions repetitions of each have been conducted.
+
+    Returns the aggregated measurements of both, like evaluateCommand, each
+    extended by the achieved 'relative_overhead' and its 'relative_overhead_ci'.
+    Like evaluateCommand, no further repetitions are started once one timed out,
+    and the first `warmup_runs` runs of both models are discarded. Runs killed
+    by the watchdog are left out of the confidence interval and the averages.
+    """
+    if max_repetitions < 2:
+        raise ValueError('At least 2 repetitions are needed for a confidence interval, got max_repetitions={}.'.format(max_repetitions))
+
+    min_repetitions = min(max(min_repetitions, 2), max_repetitions) # we need at least 2 samples for a variance
+    pairs_per_round = max(1, len(cores) // 2) if cores is not None else 1
+
+    for args in [plain_args, enforcement_args] * warmup_runs:
+        runMeasured(*args, core=cores[0] if cores is not None else None, timeout=timeout, memory_limit=memory_limit)
+
+    plain, enforcement = [], []
+    overhead, half_width = math.nan, math.inf
+    while True:
+        pairs = min(pairs_per_round, max_repetitions - len(plain))
+        if pairs <= 0:
+            break
+
+        commands = [plain_args, enforcement_args] * pairs
+        if cores is None:
+            measurements = [runMeasured(*args, perf_events=perf_events, memory_sample_interval=memory_sample_interval, timeout=timeout, memory_limit=memory_limit) for args in commands]
+        else:
+            measurements = mapOnCores(
+                    cores,
+                    commands,
+                    lambda args, core: runMeasured(*args, core=core, perf_events=perf_events, memory_sample_interval=memory_sample_interval, timeout=timeout, memory_limit=memory_limit)
+                )
+
+        plain += measurements[0::2]
+        enforcement += measurements[1::2]
+
+        if any(measurement.killed_by == 'timeout' for measurement in measurements):
+            break
+
+        # Runs killed for exceeding the memory limit have been cut short, so their times do not count
+        plain_user = [measurement.user for measurement in plain if measurement.killed_by is None]
+        enforcement_user = [measurement.user for measurement in enforcement if measurement.killed_by is None]
+        if min(len(plain_user), len(enforcement_user)) >= min_repetitions:
+            overhead, half_width = relativeOverheadInterval(plain_user, enforcement_user, confidence)
+
+            if half_width <= relative_ci_target:
+                break
+
+    plain_accum = aggregateMeasurements(plain)
+    enforcement_accum = aggregateMeasurements(enforcement)
+    for accum in [plain_accum, enforcement_accum]:
+        accum['relative_overhead'] = overhead
+        accum['relative_overhead_ci'] = half_width
+
+    return plain_accum, enforcement_accum
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Sequence
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+jar_path = os.path.join(repo_root, 'build', 'libs', 'sessiontypeabs-1.0-SNAPSHOT-all.jar')
+
+default_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'sessiontypeabs', 'builds')
+default_max_bytes = 2 * 1024 * 1024 * 1024
+
+_tool_digests = {}
+
+# Builds are compiled by several threads, so that one of them may evict the
+# entry another one is restoring. Restoring and evicting exclude each other.
+_cache_lock = threading.Lock()
+
+def fileDigest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def toolVersion() -> str:
+    if not os.path.exists(jar_path):
+        return 'missing'
+
+    # Hashing the tool JAR on every compilation would be wasteful, so we remember
+    # its digest as long as it is not rebuilt. Model files are small and may be
+    # edited in place within the granularity of mtime, so they are always hashed.
+    stat = os.stat(jar_path)
+    memo_key = (stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _tool_digests:
+        _tool_digests[memo_key] = fileDigest(jar_path)
+
+    return _tool_digests[memo_key]
+
+def buildKey(input_files: Sequence[str], options: Sequence[str]) -> str:
+    """
+    Content hash identifying a compilation: the contents of all input files,
+    the compiler options and the version of the SDS-tool.
+    """
+    key = hashlib.sha256()
+    key.update(toolVersion().encode())
+    for option in options:
+        key.update(b'\0option\0' + option.encode())
+    for input_file in input_files:
+        key.update(b'\0file\0' + os.path.basename(input_file).encode() + b'\0')
+        key.update(fileDigest(input_file).encode())
+
+    return key.hexdigest()
+
+def directorySize(path: str) -> int:
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            filepath = os.path.join(dirpath, filename)
+            if not os.path.islink(filepath):
+                size += os.path.getsize(filepath)
+
+    return size
+
+def restoreBuild(key: str, target_dir: str, cache_dir: str = default_cache_dir) -> bool:
+    """
+    Replaces target_dir by the cached build for key.
+    Returns False, if there is no such build or it could not be copied, e.g.
+    because another process evicted it in the meantime.
+    """
+    entry = os.path.join(cache_dir, key)
+    with _cache_lock:
+        if not os.path.isdir(entry):
+            return False
+
+        shutil.rmtree(target_dir, ignore_errors=True)
+        try:
+            now = time.time()
+            os.utime(entry, (now, now)) # the modification time serves as LRU timestamp
+
+            shutil.copytree(os.path.join(entry, 'build'), target_dir, symlinks=True)
+        except (OSError, shutil.Error):
+            shutil.rmtree(target_dir, ignore_errors=True)
+            return False
+
+    return True
+
+def storeBuild(key: str, source_dir: str, cache_dir: str = default_cache_dir, max_bytes: int = default_max_bytes):
+    entry = os.path.join(cache_dir, key)
+    if os.path.isdir(entry):
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Copy into a temporary entry first, so that concurrent or interrupted
+    # compilations never leave a half written build in the cache
+    staging = os.path.join(cache_dir, '.staging-{}-{}'.format(key, os.getpid()))
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.copytree(source_dir, os.path.join(staging, 'build'), symlinks=True)
+    try:
+        os.rename(staging, entry)
+    except OSError: # someone else stored the same build in the meantime
+        shutil.rmtree(staging, ignore_errors=True)
+
+    evictBuilds(cache_dir, max_bytes)
+
+def evictBuilds(cache_dir: str = default_cache_dir, max_bytes: int = default_max_bytes):
+    """
+    Removes the least recently used builds until the cache occupies at most
+    max_bytes.
+    """
+    with _cache_lock:
+        _evictBuilds(cache_dir, max_bytes)
+
+def _evictBuilds(cache_dir: str, max_bytes: int):
+    entries = [
+            os.path.join(cache_dir, name)
+            for name in os.listdir(cache_dir)
+            if not name.startswith('.')
+        ]
+    entries.sort(key=os.path.getmtime)
+
+    sizes = {entry: directorySize(entry) for entry in entries}
+    total = sum(sizes.values())
+    for entry in entries:
+        if total <= max_bytes:
+            break
+
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
@@ -1,12 +1,65 @@
+import os
+import shutil
 import subprocess
-from typing import Iterable
+import threading
+from typing import Iterable, Optional, Dict, Sequence
+from evaluation_lib.build_cache import buildKey, restoreBuild, storeBuild
+from evaluation_lib.compile_server import sdstool_path, compileRemote
+from evaluation_lib.evaluate import pinnedTo
+
+build_dir = 'gen/erl'
+
+_build_locks = {}
+_build_locks_guard = threading.Lock()
+
+def buildLock(key: str) -> threading.Lock:
+    with _build_locks_guard:
+        return _build_locks.setdefault(key, threading.Lock())
+
+def isCompiled(working_dir: str) -> bool:
+    """
+    Whether working_dir contains a runnable build. `sdstool compile` exits with
+    0 even if it rejects a model, so this is the only sign of success.
+    """
+    return os.path.exists(os.path.join(working_dir, build_dir, 'run'))
+
+def checkCompiled(working_dir: str, output: str = ''):
+    """
+    Raises a RuntimeError with the output of the compiler, unless working_dir
+    contains a runnable build.
+    """
+    if not isCompiled(working_dir):
+        raise RuntimeError('The SDS-tool did not compile the model in {}:\n{}'.format(working_dir, output))
+
+def runCompiler(options, args, server_port: Optional[int], working_dir: str, cores: Optional[Sequence[int]]):
+    """
+    Returns whether compilation succeeded and, if a compile server has been
+    used, how long each compilation phase took in milliseconds.
+    """
+    if server_port is None:
+        proc = subprocess.run([sdstool_path, "compile", *options, *args], cwd=working_dir, preexec_fn=pinnedTo(cores))
+        return proc.returncode == 0, None
+
+    result = compileRemote([*options, *args], working_dir=working_dir, port=server_port)
+    print(result.output, end='')
+    return result.success, result.phase_millis
 
 def compileModel(
         args,
         logActivationDelay: Iterable[str] = [],
         logSchedulerCalls: Iterable[str] = [],
-        no_static_checks: bool = False
-):
+        no_static_checks: bool = False,
+        use_cache: bool = False,
+        server_port: Optional[int] = None,
+        working_dir: str = '.',
+        cores: Optional[Sequence[int]] = None
+) -> Optional[Dict[str, int]]:
+    """
+    Compiles the given files (paths relative to working_dir) to Erlang code in
+    working_dir/gen/erl.
+    If cores is given, the compiler is restricted to them, e.g. to keep it away
+    from cores used for measurements.
+    """
     options = []
     options += sum(
             map(
@@ -25,4 +78,23 @@ def compileModel(
     if no_static_checks:
         options += ["--noStaticChecks"]
 
-    subprocess.run(["../../../../sdstool", "compile", *options, *args])
+    if not use_cache:
+        _, phase_millis = runCompiler(options, args, server_port, working_dir, cores)
+        return phase_millis
+
+    # Reuse the Erlang code of an earlier compilation of the same inputs, if
+    # there is one. Otherwise compile from scratch and remember the result.
+    # Concurrent compilations of the same inputs wait for the first one and then
+    # reuse its result.
+    target_dir = os.path.join(working_dir, build_dir)
+    key = buildKey([os.path.join(working_dir, arg) for arg in args], options)
+    with buildLock(key):
+        if restoreBuild(key, target_dir):
+            return None
+
+        shutil.rmtree(target_dir, ignore_errors=True)
+        success, phase_millis = runCompiler(options, args, server_port, working_dir, cores)
+        if success and isCompiled(working_dir):
+            storeBuild(key, target_dir)
+
+    return phase_millis
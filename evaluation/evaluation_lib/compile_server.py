@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import os
+import socket
+import subprocess
+import threading
+from typing import Sequence, Dict, NamedTuple
+from evaluation_lib.build_cache import repo_root
+
+sdstool_path = os.path.join(repo_root, 'sdstool')
+default_port = 7878
+
+class CompileResult(NamedTuple):
+    success: bool
+    phase_millis: Dict[str, int] # e.g. parse, projection, static checks, enforcement, erlang codegen
+    output: str
+
+def drain(stream):
+    for _ in stream:
+        pass
+
+def startCompileServer(port: int = default_port) -> subprocess.Popen:
+    """
+    Starts `sdstool compileServer` and waits until it accepts requests.
+    The caller is responsible for terminating the returned process.
+    """
+    server = subprocess.Popen(
+            [sdstool_path, 'compileServer', '--port', str(port)],
+            stdout=subprocess.PIPE
+        )
+
+    for line in server.stdout:
+        if line.decode().startswith('Compile server listening'):
+            # Output of requests is sent over their connections, but the JVM and
+            # its child processes may still write to stdout. Unless the pipe is
+            # drained, the server blocks once its buffer is full.
+            threading.Thread(target=drain, args=(server.stdout,), daemon=True).start()
+            return server
+
+    server.wait()
+    raise RuntimeError('Compile server could not be started.')
+
+def compileRemote(args: Sequence[str], working_dir: str = '.', port: int = default_port) -> CompileResult:
+    """
+    Lets a running compile server compile the given files in working_dir.
+    `args` are the same as for `sdstool compile`.
+    """
+    with socket.create_connection(('127.0.0.1', port)) as connection:
+        request = '\n'.join([os.path.abspath(working_dir), *args]) + '\n\n'
+        connection.sendall(request.encode())
+
+        response = connection.makefile('r', encoding='utf-8')
+        success = response.readline().strip() == 'ok'
+
+        phase_millis = {}
+        line = response.readline()
+        while line.startswith('phase '):
+            phase, millis = line[len('phase '):].strip().rsplit(' ', 1)
+            phase_millis[phase] = int(millis)
+            line = response.readline()
+
+        output = response.read()
+
+    return CompileResult(success=success, phase_millis=phase_millis, output=output)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import functools
+import os
+import platform
+import subprocess
+from typing import Sequence, Optional, List
+from evaluation_lib.build_cache import toolVersion
+
+# Conditions of the machine which affect measurements. They are checked before
+# an experiment and recorded with every row of its results, so that results
+# from different machines or setups can be told apart. Governor, turbo boost and
+# load are recorded as of the start of the cell of the row.
+
+metadata_prefix = 'env_'
+
+def readFirstLine(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.readline().strip()
+    except OSError:
+        return None
+
+def cpuModel() -> Optional[str]:
+    try:
+        with open('/proc/cpuinfo') as cpuinfo_file:
+            for line in cpuinfo_file:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+
+    return None
+
+@functools.lru_cache(maxsize=None)
+def erlangVersion() -> Optional[str]:
+    try:
+        process = subprocess.run(
+                [
+                    'erl', '-noshell', '-eval',
+                    'io:format("~s ~s", [erlang:system_info(otp_release), erlang:system_info(version)]), halt().'
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=30
+            )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    return process.stdout.decode().strip() or None
+
+def governors(cores: Sequence[int]) -> List[str]:
+    return sorted({
+        governor
+        for governor in (
+            readFirstLine('/sys/devices/system/cpu/cpu{}/cpufreq/scaling_governor'.format(core))
+            for core in cores
+        )
+        if governor is not None
+    })
+
+def turboEnabled() -> Optional[bool]:
+    # intel_pstate reports the inverse, acpi-cpufreq (e.g. on AMD) uses boost
+    no_turbo = readFirstLine('/sys/devices/system/cpu/intel_pstate/no_turbo')
+    if no_turbo is not None:
+        return no_turbo == '0'
+
+    boost = readFirstLine('/sys/devices/system/cpu/cpufreq/boost')
+    if boost is not None:
+        return boost == '1'
+
+    return None
+
+def volatileMetadata(cores: Sequence[int]) -> dict:
+    """
+    The state of the cores the measurements run on. It may change while an
+    experiment runs, so it should be sampled again for every cell.
+    """
+    return {
+        metadata_prefix + 'governor': ','.join(governors(cores)) or None,
+        metadata_prefix + 'turbo': turboEnabled(),
+        metadata_prefix + 'load': os.getloadavg()[0]
+    }
+
+def environmentMetadata(cores: Sequence[int]) -> dict:
+    """
+    Describes the machine, the tools and the state of the cores the
+    measurements run on.
+    """
+    return {
+        metadata_prefix + 'hostname': platform.node(),
+        metadata_prefix + 'kernel': platform.release(),
+        metadata_prefix + 'cpu_model': cpuModel(),
+        metadata_prefix + 'sdstool': toolVersion(),
+        metadata_prefix + 'erlang': erlangVersion(),
+        **volatileMetadata(cores)
+    }
+
+def checkEnvironment(metadata: dict, max_load: float = 1.0) -> List[str]:
+    """
+    Returns a warning for every condition which makes measurements noisy.
+    """
+    warnings = []
+
+    governor = metadata[metadata_prefix + 'governor']
+    if governor is not None and governor != 'performance':
+        warnings.append(
+                'The CPU frequency governor is {}, not performance, so the frequency varies with load.'.format(governor)
+            )
+
+    if metadata[metadata_prefix + 'turbo']:
+        warnings.append('Turbo boost is enabled, so the frequency depends on temperature.')
+
+    if metadata[metadata_prefix + 'load'] > max_load:
+        warnings.append(
+                'The load average is {:.2f}, other processes compete with the measurements.'.format(metadata[metadata_prefix + 'load'])
+            )
+
+    if metadata[metadata_prefix + 'erlang'] is None:
+        warnings.append('The version of Erlang could not be determined.')
+
+    return warnings
@@ -1,78 +1,616 @@
 #!/usr/bin/env python3
+import math
 import subprocess
 import re
-from typing import Iterable
+import os
+import queue
+import random
+import resource
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Sequence, Optional, Callable, List, Dict, NamedTuple, TypeVar, Union
 
-perf_real_time_regex = re.compile("(?P<seconds>\d+[\.,]\d+) seconds time elapsed")
-perf_user_time_regex = re.compile("(?P<seconds>\d+[\.,]\d+) seconds user")
-perf_sys_time_regex = re.compile("(?P<seconds>\d+[\.,]\d+) seconds sys")
+T = TypeVar('T')
+U = TypeVar('U')
 
-time_stats_regex = re.compile("TimeStats\((?P<stats>[^)]+)\)")
+# Field separator for perf stat -x. We do not use ',' since some locales use it as decimal separator.
+perf_separator = ';'
 
-activation_delay_regex = re.compile("\[SessionTypeABS\] Scheduler of class [^\s]+ could not find a viable activation\.")
-scheduler_call_regex = re.compile("\[SessionTypeABS\] Scheduler of class [^\s]+ has been called\.")
+# Matches both kinds of scheduler log messages, so that the log needs to be scanned only once
+scheduler_event_regex = re.compile(
+        "\\[SessionTypeABS\\] Scheduler of class (?P<class>[^\\s]+) "
+        "(?:(?P<scheduler_calls>has been called)|(?P<delays>could not find a viable activation))\\."
+    )
+scheduler_events = ['scheduler_calls', 'delays']
 
-def runTime(*args):
-    proc = subprocess.run(["/usr/bin/time", "-f", "TimeStats(%e,%U,%S,%M)", *args],capture_output=True)
-    stderr = proc.stderr.decode()
-    stdout = proc.stdout.decode()
+def parseCpuList(cpu_list: str) -> List[int]:
+    # Parses the kernel's cpu list format, e.g. "0-3,8,10-11"
+    cores = []
+    for part in cpu_list.strip().split(','):
+        if part == '':
+            continue
 
-    time_result = time_stats_regex.search(stderr).group('stats').split(',')
-    return {
-            "real": float(time_result[0].replace(',', '.')),
-            "sys": float(time_result[1].replace(',', '.')),
-            "user": float(time_result[2].replace(',', '.')),
-            "maximum_rss": float(time_result[3]),
-            "stdout": stdout
+        bounds = part.split('-')
+        cores += range(int(bounds[0]), int(bounds[-1]) + 1)
+
+    return cores
+
+def availableCores() -> List[int]:
+    # Prefer cores which have been isolated from the kernel scheduler (isolcpus=),
+    # so that measurements do not compete with the rest of the system
+    try:
+        with open('/sys/devices/system/cpu/isolated') as isolated_file:
+            isolated = parseCpuList(isolated_file.read())
+    except OSError:
+        isolated = []
+
+    if len(isolated) > 0:
+        return isolated
+
+    return sorted(os.sched_getaffinity(0))
+
+def pinnedTo(cores: Optional[Union[int, Iterable[int]]]):
+    # Returns a preexec_fn for subprocess, which restricts the child to a core or set of cores
+    if cores is None:
+        return None
+
+    core_set = {cores} if isinstance(cores, int) else set(cores)
+    return lambda: os.sched_setaffinity(0, core_set)
+
+def mapOnCores(cores: Sequence[int], items: Sequence[T], task: Callable[[T, int], U]) -> List[U]:
+    """
+    Applies task to all items on a pool with one worker per core.
+    Every call is handed the core it owns exclusively while running.
+    Results are returned in the order of the items.
+    """
+    free_cores = queue.Queue()
+    for core in cores:
+        free_cores.put(core)
+
+    def worker(item):
+        core = free_cores.get()
+        try:
+            return task(item, core)
+        finally:
+            free_cores.put(core)
+
+    with ThreadPoolExecutor(max_workers=len(cores)) as executor:
+        return list(executor.map(worker, items))
+
+def runOnCores(cores: Sequence[int], times: int, task: Callable[[int], T]) -> List[T]:
+    """
+    Executes task `times` times on a pool with one worker per core, see mapOnCores.
+    """
+    return mapOnCores(cores, range(0, times), lambda _, core: task(core))
+
+class Measurement(NamedTuple):
+    real: float # seconds
+    user: float
+    sys: float
+    maximum_rss: float # KB
+    stdout: str
+    exit_code: int
+    core: Optional[int] = None
+    counters: Dict[str, Optional[float]] = {} # perf event name -> counter value, None if not counted
+    first_output: Optional[float] = None # seconds until the first line of output, None if there was none
+    memory: Optional[Dict[str, List[float]]] = None # time series of memory usage, see startMemorySampler
+    killed_by: Optional[str] = None # 'timeout' or 'memory' if the watchdog killed the run, see startWatchdog
+
+# Named sets of perf events for evaluateCommand. Events in braces form a group,
+# which perf always counts at the same time, so that their ratios are exact.
+perf_profiles = {
+        'default': [], # whatever perf stat counts by default
+        'compute': ['{cycles,instructions}', '{cache-references,cache-misses}', '{branches,branch-misses}'],
+        'scheduling': ['task-clock', 'context-switches', 'cpu-migrations', 'page-faults'],
     }
+perf_profiles['full'] = perf_profiles['compute'] + perf_profiles['scheduling']
+
+def perfCommand(args: Sequence[str], events: Sequence[str], output_file: str) -> List[str]:
+    event_options = ['-e', ','.join(events)] if len(events) > 0 else []
+
+    return ['perf', 'stat', '-x', perf_separator, '-o', output_file, *event_options, '--', *args]
+
+# Modifiers like :u, which perf appends to the events if it may only count in
+# user mode (perf_event_paranoid >= 2)
+perf_modifier_regex = re.compile(r':[ukhHGIpPSDW]+$')
+
+def parsePerfCsv(output: str) -> Dict[str, Optional[float]]:
+    """
+    Counters by event name without modifiers, so that e.g. cycles:u is reported
+    as cycles. Events which only differ in their modifiers keep them.
+    """
+    counters = {}
+    for line in output.splitlines():
+        if line.strip() == '' or line.startswith('#'):
+            continue
 
-def runPerf(*args):
-    proc = subprocess.run(["perf", "stat", *args],capture_output=True)
-    stderr = proc.stderr.decode()
-    stdout = proc.stdout.decode()
-    return {
-        'real': float(perf_real_time_regex.search(stderr).group('seconds').replace(',', '.')),
-        'user': float(perf_user_time_regex.search(stderr).group('seconds').replace(',', '.')),
-        'sys': float(perf_sys_time_regex.search(stderr).group('seconds').replace(',', '.')),
-        'stdout': stdout
+        fields = line.split(perf_separator)
+        if len(fields) < 3:
+            continue
+
+        value, event = fields[0], fields[2]
+        if perf_modifier_regex.sub('', event) not in counters:
+            event = perf_modifier_regex.sub('', event)
+        try:
+            counters[event] = float(value.replace(',', '.'))
+        except ValueError: # <not counted> or <not supported>
+            counters[event] = None
+
+    return counters
+
+# Memory usage which is sampled while a command runs, in KB, and the files of
+# /proc/<pid> it is read from.
+# data is the virtual size of the heap and data segments of the process.
+memory_fields = {
+        'rss': ('status', 'VmRSS'),
+        'anon': ('smaps_rollup', 'Anonymous'),
+        'data': ('status', 'VmData')
     }
 
-def evaluateCommand(times: int, *args):
+def processTree(pid: int) -> List[int]:
+    pids = [pid]
+    index = 0
+    while index < len(pids):
+        try:
+            with open('/proc/{0}/task/{0}/children'.format(pids[index])) as children_file:
+                pids += [int(child) for child in children_file.read().split()]
+        except OSError:
+            pass
+        index += 1
+
+    return pids
+
+def memoryUsage(pid: int) -> Optional[Dict[str, float]]:
+    """
+    Sums the memory usage of a process and all its descendants.
+    Returns None, if the process has already terminated.
+    """
+    usage = {field: 0.0 for field in memory_fields}
+    for tree_pid in processTree(pid):
+        for field, (proc_file, key) in memory_fields.items():
+            try:
+                with open('/proc/{}/{}'.format(tree_pid, proc_file)) as memory_file:
+                    for line in memory_file:
+                        if line.startswith(key + ':'):
+                            usage[field] += float(line.split()[1])
+                            break
+            except OSError:
+                pass
+
+    # Zombies do not report any memory
+    return usage if usage['rss'] > 0 else None
+
+def startMemorySampler(pid: int, interval: float, start: float) -> Callable[[], Dict[str, List[float]]]:
+    """
+    Polls the memory usage of the given process every `interval` seconds in a
+    background thread, until the returned function is called, which returns the
+    collected time series: 'time' (seconds since start) and one series per
+    entry of memory_fields.
+    """
+    series = {field: [] for field in ['time', *memory_fields]}
+    stopped = threading.Event()
+
+    def sample():
+        while True:
+            usage = memoryUsage(pid)
+            if usage is None:
+                return
+
+            series['time'].append(time.monotonic() - start)
+            for field, value in usage.items():
+                series[field].append(value)
+
+            if stopped.wait(interval):
+                return
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    def stop():
+        stopped.set()
+        sampler.join()
+        return series
+
+    return stop
+
+def sessionProcesses(sid: int) -> List[int]:
+    # Unlike processTree, this also finds descendants which have been orphaned
+    # and reparented to init, unless they started a session of their own
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open('/proc/{}/stat'.format(entry)) as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue
+
+        # The command name in parentheses may contain spaces, the session id is
+        # the fourth field after it
+        if int(stat[stat.rindex(')') + 2:].split()[3]) == sid:
+            pids.append(int(entry))
+
+    return pids
+
+def killSession(pid: int):
+    """
+    Kills a process, which has been started in a session of its own, and all
+    processes it spawned, e.g. the Erlang VM started by the run script of a model.
+    """
+    for session_pid in set(processTree(pid) + sessionProcesses(pid)):
+        try:
+            os.kill(session_pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+def supervisedPreexec(cores: Optional[Union[int, Iterable[int]]], timeout: Optional[float]):
+    """
+    preexec_fn for subprocess, which pins the child like pinnedTo and, if a
+    timeout is given, limits its CPU time, so that the kernel stops runaway
+    runs even if the watchdog should not.
+    """
+    pin = pinnedTo(cores)
+    if timeout is None:
+        return pin
+
+    # All schedulers of the Erlang VM account to the same CPU time
+    cpu_time_limit = int(timeout * os.cpu_count()) + 1
+
+    def preexec():
+        if pin is not None:
+            pin()
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_limit + 1))
+
+    return preexec
+
+def killReason(killed_by: Optional[str], exit_code: Optional[int]) -> Optional[str]:
+    """
+    Why a supervised run has been killed: by the watchdog, or by the CPU time
+    limit of supervisedPreexec, which the kernel enforces with SIGXCPU. A run
+    script which does not exec the Erlang VM reports this like a shell does.
+    """
+    if killed_by is None and exit_code in [-signal.SIGXCPU, 128 + signal.SIGXCPU]:
+        return 'timeout'
+
+    return killed_by
+
+def startWatchdog(pid: int, timeout: Optional[float], memory_limit: Optional[float], start: float, poll_interval: float = 0.1) -> Callable[[], Optional[str]]:
+    """
+    Kills the session of the given process (see killSession) once it ran longer
+    than `timeout` seconds or its process tree used more than `memory_limit` KB
+    of resident memory.
+    The returned function stops the watchdog and returns why the process has
+    been killed, 'timeout' or 'memory', or None if it has not.
+    """
+    killed_by = [None]
+    stopped = threading.Event()
+
+    def watch():
+        while not stopped.wait(poll_interval):
+            if timeout is not None and time.monotonic() - start > timeout:
+                killed_by[0] = 'timeout'
+            elif memory_limit is not None:
+                usage = memoryUsage(pid)
+                if usage is not None and usage['rss'] > memory_limit:
+                    killed_by[0] = 'memory'
+
+            if killed_by[0] is not None:
+                killSession(pid)
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+
+    def stop():
+        stopped.set()
+        watcher.join()
+        return killed_by[0]
+
+    return stop
+
+def erlEnvironment(erl_flags: Optional[str]) -> Optional[Dict[str, str]]:
+    # The Erlang VM reads additional command line flags from ERL_FLAGS
+    if erl_flags is None:
+        return None
+
+    env = dict(os.environ)
+    env['ERL_FLAGS'] = (env.get('ERL_FLAGS', '') + ' ' + erl_flags).strip()
+
+    return env
+
+def exitCode(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    else:
+        return os.WEXITSTATUS(status)
+
+def runMeasured(*args, core: Optional[int] = None, perf_events: Optional[Sequence[str]] = None, working_dir: Optional[str] = None, memory_sample_interval: Optional[float] = None, affinity: Optional[Sequence[int]] = None, erl_flags: Optional[str] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> Measurement:
+    """
+    Runs the given command once and collects wall clock time, CPU times and peak
+    memory usage of it (including all of its children) from the rusage of the
+    process.
+    If `perf_events` is given, the command is run under `perf stat` and the
+    counters of these events (perf's defaults, if empty) are collected too.
+    If `memory_sample_interval` is given, the memory usage is sampled at this
+    interval [s] while the command runs.
+    `affinity` restricts the command to a set of cores, unless it is pinned to
+    a single `core`, and `erl_flags` are passed to the Erlang VM.
+    If `timeout` [s] or `memory_limit` [KB] are given, the command and all its
+    descendants are killed when exceeding them, see startWatchdog.
+    """
+    with tempfile.NamedTemporaryFile(mode='r', prefix='perf', suffix='.csv') as perf_output:
+        command = list(args)
+        if perf_events is not None:
+            command = perfCommand(command, perf_events, perf_output.name)
+
+        # Supervised commands get a session of their own, so that the watchdog
+        # can kill everything they spawned
+        supervised = timeout is not None or memory_limit is not None
+
+        start = time.monotonic()
+        proc = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=supervisedPreexec(core if core is not None else affinity, timeout),
+                cwd=working_dir,
+                env=erlEnvironment(erl_flags),
+                start_new_session=supervised
+            )
+        stop_watchdog = None
+        if supervised:
+            stop_watchdog = startWatchdog(proc.pid, timeout, memory_limit, start)
+        stop_memory_sampler = None
+        if memory_sample_interval is not None:
+            stop_memory_sampler = startMemorySampler(proc.pid, memory_sample_interval, start)
+        # The first line is printed by the model itself, so everything before it
+        # is mostly startup of the Erlang VM
+        first_line = proc.stdout.readline()
+        first_output = time.monotonic() - start if len(first_line) > 0 else None
+        stdout = (first_line + proc.stdout.read()).decode()
+        proc.stdout.close()
+        memory = stop_memory_sampler() if stop_memory_sampler is not None else None
+        killed_by = stop_watchdog() if stop_watchdog is not None else None
+
+        _, status, rusage = os.wait4(proc.pid, 0)
+        real = time.monotonic() - start
+        proc.returncode = exitCode(status) # we reaped the child ourselves
+        if supervised:
+            killed_by = killReason(killed_by, proc.returncode)
+
+        counters = parsePerfCsv(perf_output.read()) if perf_events is not None else {}
+
+    return Measurement(
+            real=real,
+            user=rusage.ru_utime,
+            sys=rusage.ru_stime,
+            maximum_rss=float(rusage.ru_maxrss), # Linux reports KB
+            stdout=stdout,
+            exit_code=proc.returncode,
+            core=core,
+            counters=counters,
+            first_output=first_output,
+            memory=memory,
+            killed_by=killed_by
+        )
+
+def evaluateCommand(times: int, *args, cores: Optional[Sequence[int]] = None, perf_events: Optional[Sequence[str]] = None, memory_sample_interval: Optional[float] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None, warmup_runs: int = 0):
+    """
+    Runs the given command `times` times and averages the measurements.
+    If `cores` is given, repetitions are executed in parallel, each one pinned
+    to one of these cores. Otherwise they run one after another.
+    Once a repetition timed out, no further ones are started, since they would
+    most likely stall as well.
+    The first `warmup_runs` runs are discarded, they only warm up caches.
+    """
+    stalled = threading.Event()
+
+    def run(core: Optional[int]) -> Measurement:
+        return runMeasured(
+                *args,
+                core=core,
+                perf_events=perf_events,
+                memory_sample_interval=memory_sample_interval,
+                timeout=timeout,
+                memory_limit=memory_limit
+            )
+
+    def repetition(core: Optional[int]) -> Optional[Measurement]:
+        if stalled.is_set():
+            return None
+
+        measurement = run(core)
+        if measurement.killed_by == 'timeout':
+            stalled.set()
+
+        return measurement
+
+    if cores is None:
+        for i in range(0, warmup_runs):
+            run(None)
+        repetitions = [repetition(None) for i in range(0, times)]
+    else:
+        runOnCores(cores, warmup_runs, run)
+        repetitions = runOnCores(cores, times, repetition)
+
+    return aggregateMeasurements([measurement for measurement in repetitions if measurement is not None])
+
+def evaluateInterleaved(
+        times: int,
+        commands: Dict[str, Sequence[str]],
+        warmup_runs: int = 0,
+        seed: Optional[int] = None,
+        cores: Optional[Sequence[int]] = None,
+        **run_options
+) -> Dict[str, dict]:
+    """
+    Like evaluateCommand for several commands at once, e.g. the plain and the
+    enforced model, whose repetitions are executed in a random order, so that
+    drift over time (temperature, frequency, caches) affects all of them alike.
+    `warmup_runs` runs of every command are executed first and discarded.
+    Once a repetition of a command timed out, no further ones of this command
+    are started, like in evaluateCommand.
+    Every result additionally carries the position of each repetition in the
+    schedule ('run_order').
+    `run_options` are passed to runMeasured.
+    """
+    warmups = [name for name in commands for i in range(0, warmup_runs)]
+    schedule = [name for name in commands for i in range(0, times)]
+    random.Random(seed).shuffle(schedule)
+    stalled = {name: threading.Event() for name in commands}
+
+    def run(name: str, core: Optional[int]) -> Measurement:
+        return runMeasured(*commands[name], core=core, **run_options)
+
+    def repetition(name: str, core: Optional[int]) -> Optional[Measurement]:
+        if stalled[name].is_set():
+            return None
+
+        measurement = run(name, core)
+        if measurement.killed_by == 'timeout':
+            stalled[name].set()
+
+        return measurement
+
+    if cores is None:
+        for name in warmups:
+            run(name, None)
+        measurements = [repetition(name, None) for name in schedule]
+    else:
+        mapOnCores(cores, warmups, run)
+        measurements = mapOnCores(cores, schedule, repetition)
+
+    evaluations = {}
+    for name in commands:
+        positions = [
+                position
+                for position, scheduled in enumerate(schedule)
+                if scheduled == name and measurements[position] is not None
+            ]
+        evaluations[name] = aggregateMeasurements([measurements[position] for position in positions])
+        evaluations[name]['run_order'] = positions
+
+    return evaluations
+
+def aggregateMeasurements(repetitions: Sequence[Measurement]):
+    """
+    Averages measurements and collects their stdouts and per repetition samples.
+    Repetitions killed by the watchdog are kept in the samples, but not
+    averaged, since they have been cut short. If all of them have been killed,
+    the averages are NaN.
+    """
+    completed = [repetition for repetition in repetitions if repetition.killed_by is None]
+    times = len(completed)
     accum = {
             'real': 0, # seconds
             'sys': 0,
             'user': 0,
             'maximum_rss': 0, # KB
-            'stdouts': []
+            'counters': {},
+            'stdouts': [],
+            'samples': [] # per repetition measurements, including the core they ran on
     }
-    for i in range(1,times+1):
-        perfResults = runPerf(*args)
-        timeResults = runTime(*args)
+    for repetition in repetitions:
+        accum['stdouts'] = accum['stdouts'] + [repetition.stdout]
+        accum['samples'] = accum['samples'] + [{
+                key: value for key, value in repetition._asdict().items() if key != 'stdout'
+            }]
+
+    for repetition in completed:
+        accum['real'] = accum['real'] + repetition.real
+        accum['sys'] = accum['sys'] + repetition.sys
+        accum['user'] = accum['user'] + repetition.user
+        accum['maximum_rss'] = accum['maximum_rss'] + repetition.maximum_rss
 
-        accum['real'] = accum['real'] + perfResults['real']
-        accum['sys'] = accum['sys'] + perfResults['sys']
-        accum['user'] = accum['user'] + perfResults['user']
-        accum['maximum_rss'] = accum['maximum_rss'] + timeResults['maximum_rss']
-        accum['stdouts'] = accum['stdouts'] + [perfResults['stdout'], timeResults['stdout']]
+    accum['real'] = accum['real'] / times if times > 0 else math.nan
+    accum['sys'] = accum['sys'] / times if times > 0 else math.nan
+    accum['user'] = accum['user'] / times if times > 0 else math.nan
+    accum['maximum_rss'] = accum['maximum_rss'] / times if times > 0 else math.nan
 
-    accum['real'] = accum['real'] / times
-    accum['sys'] = accum['sys'] / times
-    accum['user'] = accum['user'] / times
-    accum['maximum_rss'] = accum['maximum_rss'] / times
+    for event in set().union(*[repetition.counters.keys() for repetition in completed]):
+        values = [repetition.counters[event] for repetition in completed if repetition.counters.get(event) is not None]
+        accum['counters'][event] = sum(values) / len(values) if len(values) > 0 else None
 
     return accum
 
-def evaluateSchedulerLog(times: int, *args):
-    schedulerCallSum = 0
-    delaysSum = 0
+def streamSchedulerLog(*args, record_timeline: bool = False, timeout: Optional[float] = None):
+    """
+    Runs the given command and counts the scheduler log messages it prints per
+    class while reading its output line by line, without buffering it.
+    If record_timeline is set, also returns every event as a tuple
+    (event, class, seconds since start).
+    The last value returned is the reason the watchdog killed the command, if it
+    did, see startWatchdog.
+    """
+    counts = {}
+    timeline = []
+
+    start = time.monotonic()
+    with subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=supervisedPreexec(None, timeout),
+            start_new_session=timeout is not None
+        ) as proc:
+        stop_watchdog = startWatchdog(proc.pid, timeout, None, start) if timeout is not None else None
+        for line in proc.stdout:
+            for match in scheduler_event_regex.finditer(line.decode()):
+                event = 'scheduler_calls' if match.group('scheduler_calls') is not None else 'delays'
+                clazz = match.group('class')
+
+                class_counts = counts.setdefault(clazz, dict.fromkeys(scheduler_events, 0))
+                class_counts[event] += 1
+
+                if record_timeline:
+                    timeline.append((event, clazz, time.monotonic() - start))
+
+        killed_by = stop_watchdog() if stop_watchdog is not None else None
+
+    if timeout is not None:
+        killed_by = killReason(killed_by, proc.returncode)
+
+    return counts, timeline, killed_by
+
+def evaluateSchedulerLog(times: int, *args, record_timeline: bool = False, timeout: Optional[float] = None):
+    per_class = {}
+    timelines = []
+    completed_runs = 0
+    killed_runs = 0
     for i in range(0, times):
-        proc = subprocess.run(args, capture_output=True)
-        stdout = proc.stdout.decode()
+        counts, timeline, killed_by = streamSchedulerLog(*args, record_timeline=record_timeline, timeout=timeout)
+        if killed_by is not None:
+            # The counts of a stalled run are incomplete and further runs would
+            # most likely stall as well
+            killed_runs += 1
+            break
+        completed_runs += 1
+
+        for clazz, class_counts in counts.items():
+            class_sums = per_class.setdefault(clazz, dict.fromkeys(scheduler_events, 0))
+            for event in scheduler_events:
+                class_sums[event] += class_counts[event]
 
-        schedulerCallSum += len(scheduler_call_regex.findall(stdout))
-        delaysSum += len(activation_delay_regex.findall(stdout))
+        if record_timeline:
+            timelines.append(timeline)
 
-    return {
-        'scheduler_calls': schedulerCallSum / times,
-        'delays': delaysSum / times
+    for class_sums in per_class.values():
+        for event in scheduler_events:
+            class_sums[event] = class_sums[event] / completed_runs
+
+    # Without a completed run there are no counts, which must not be mistaken for a model without scheduler calls
+    result = {
+        event: sum(class_sums[event] for class_sums in per_class.values()) if completed_runs > 0 else math.nan
+        for event in scheduler_events
     }
+    result['per_class'] = per_class
+    result['killed_runs'] = killed_runs
+    if record_timeline:
+        result['timelines'] = timelines
+
+    return result
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+import importlib
+import itertools
+import os
+import toml
+from typing import Sequence, Optional, Dict, List, Tuple
+
+from evaluation_lib.adaptive import evaluateAdaptive
+from evaluation_lib.compile import compileModel
+from evaluation_lib.environment import environmentMetadata, volatileMetadata, checkEnvironment
+from evaluation_lib.evaluate import runMeasured, aggregateMeasurements, evaluateCommand, evaluateInterleaved, evaluateSchedulerLog, availableCores, perf_profiles
+from evaluation_lib.order_violations import evaluateOrderSequentially
+from evaluation_lib.outcomes import evaluateOutcomes
+from evaluation_lib.pipeline import parallelMap
+from evaluation_lib.profile import recordStacks, foldStacks, saveFolded, diffFolded, saveDiffFolded, saveDiffFlamegraph, defaultErlFlags
+from evaluation_lib.render_template import renderTemplate
+from evaluation_lib.results_store import resultsPath, stdoutsPath, measurementRows, schedulerLogRows, warmRows, outcomeRows, subtractStartup, measureCell, measureCells, isCellDone, loadCell, updateIndex
+from evaluation_lib.warm_run import evaluateWarm
+from evaluation_lib.workspace import createWorkspace, removeWorkspace
+
+startup_model_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'startup', 'Startup.abs')
+
+default_timeout = 3600 # seconds
+# Variants which adaptive sampling measures alternately, see evaluateAdaptive
+adaptively_sampled_variants = ['plain', 'enforcement']
+
+def loadExperiment(path: str) -> dict:
+    """
+    Loads an experiment specification from a TOML file, see the README for its
+    format. Paths in it are relative to the evaluation folder, except for the
+    ones in the model section, which are relative to working_dir.
+    """
+    spec = toml.load(path)
+
+    spec.setdefault('cache_dir', 'cache')
+    spec.setdefault('interval', 'times')
+    # Experiments which do not vary a parameter are measured for a single interval
+    spec.setdefault('intervals', [0])
+    spec.setdefault('matrix', {})
+    spec.setdefault('sampling', {})
+    spec['sampling'].setdefault('averaging_factor', 10)
+    spec['sampling'].setdefault('subtract_startup', False)
+    spec['sampling'].setdefault('warmup_runs', 0)
+    spec['sampling'].setdefault('interleave', False)
+    if spec['sampling']['interleave'] and 'warm_iterations' in spec['sampling']:
+        # Warm runs iterate within one Erlang VM per repetition, which can not be
+        # shuffled with the repetitions of other variants
+        raise ValueError('interleave and warm_iterations can not be combined in {}.'.format(path))
+    spec.setdefault('environment', {})
+    spec['environment'].setdefault('max_load', 1.0)
+    spec['environment'].setdefault('strict', False)
+    spec.setdefault('execution', {})
+    spec['execution'].setdefault('pipeline_depth', 1)
+    spec['execution'].setdefault('compile_workers', 1)
+    # A deadlocked model must not hold up a sweep forever, 0 disables the timeout
+    spec['execution'].setdefault('timeout', default_timeout)
+    spec['model'].setdefault('templates', {})
+    spec['model'].setdefault('files', [])
+    spec.setdefault('outcome', {})
+    spec['outcome'].setdefault('patterns', {})
+    spec['outcome'].setdefault('expected_order', [])
+
+    spec.setdefault('scaling', {})
+    spec['scaling'].setdefault('schedulers', [])
+    spec['scaling'].setdefault('affinities', ['compact'])
+    spec['scaling'].setdefault('variants', ['plain', 'enforcement'])
+    spec['scaling'].setdefault('intervals', [max(spec['intervals'])])
+    spec['scaling'].setdefault('cores', 'available')
+
+    for config in spec['configs']:
+        config.setdefault('parameters', {})
+        config.setdefault('flags', {})
+
+    return spec
+
+def expandConfigs(spec: dict) -> List[dict]:
+    """
+    Cartesian product of the configs and the matrix parameters of the experiment.
+    Every combination is named after its config and its matrix parameters.
+    """
+    matrix_names = sorted(spec['matrix'])
+    combinations = itertools.product(*[spec['matrix'][name] for name in matrix_names])
+
+    configs = []
+    for config, combination in itertools.product(spec['configs'], list(combinations)):
+        configs.append({
+            'name': config['name'] + ''.join(
+                    '-{}={}'.format(name, value) for name, value in zip(matrix_names, combination)
+                ),
+            'parameters': {**config['parameters'], **dict(zip(matrix_names, combination))},
+            'flags': config['flags']
+        })
+
+    return configs
+
+def renderModel(spec: dict, parameters: dict, target_dir: str):
+    render = spec['model'].get('render')
+    if render is not None:
+        # Some models need parameters which can not be expressed in the
+        # templates themselves, e.g. shuffled method names
+        module_name, function_name = render.split(':')
+        getattr(importlib.import_module(module_name), function_name)(parameters, target_dir)
+
+    for target, template in spec['model']['templates'].items():
+        renderTemplate(template, os.path.join(target_dir, target), parameters)
+
+profiled_variants = ['plain', 'enforcement']
+
+def profilePath(spec: dict, config: dict, interval: int, name: str) -> str:
+    return os.path.join(spec['cache_dir'], '{}_{}_{}'.format(config['name'], interval, name))
+
+def isProfilePending(spec: dict, config: dict, interval: int) -> bool:
+    if interval not in spec.get('profiling', {}).get('intervals', []):
+        return False
+
+    # A profile is complete once its differential stacks have been written, or
+    # if it could not be taken because the model has been killed
+    return not (
+        os.path.exists(profilePath(spec, config, interval, 'DiffFlamegraph.folded')) or
+        os.path.exists(profilePath(spec, config, interval, 'killed'))
+    )
+
+def profileJob(spec: dict, config: dict, interval: int, variant_dirs: Dict[str, str]):
+    """
+    Samples the call stacks of the plain and the enforced model and saves them
+    as folded stacks, together with a differential flamegraph.
+    """
+    profiling = spec['profiling']
+
+    folded = {}
+    for variant in profiled_variants:
+        print('Profiling {} for {}, variant {}'.format(config['name'], interval, variant))
+        perf_script, killed_by = recordStacks(
+                [os.path.join(variant_dirs[variant], 'gen/erl/run')],
+                frequency=profiling.get('frequency', 999),
+                erl_flags=profiling.get('erl_flags', defaultErlFlags()),
+                timeout=spec['execution']['timeout'] or None,
+                memory_limit=spec['execution'].get('memory_limit')
+            )
+        if killed_by is not None:
+            # Stacks of a run which has been cut short would not compare to the
+            # other variant, so the profile is marked as killed instead
+            print('Profiling {} for {}, variant {} has been killed by {}'.format(config['name'], interval, variant, killed_by))
+            with open(profilePath(spec, config, interval, 'killed'), 'w') as killed_file:
+                killed_file.write('{} {}\n'.format(variant, killed_by))
+            return
+
+        folded[variant] = foldStacks(perf_script)
+        if sum(folded[variant].values()) == 0:
+            raise RuntimeError('perf record sampled no stacks of {} for {}, variant {}.'.format(config['name'], interval, variant))
+        saveFolded(profilePath(spec, config, interval, '{}.folded'.format(variant)), folded[variant])
+
+    diff = diffFolded(folded['plain'], folded['enforcement'])
+    saveDiffFlamegraph(
+            profilePath(spec, config, interval, 'DiffFlamegraph.pdf'),
+            diff,
+            '{}, {} = {}'.format(config['name'], spec['interval'], interval)
+        )
+    # Written last, since it marks the profile as complete
+    saveDiffFolded(profilePath(spec, config, interval, 'DiffFlamegraph.folded'), diff)
+
+def scalingCells(spec: dict, interval: int) -> List[Tuple[str, int, str, str]]:
+    """
+    (variant, scheduler count, affinity, cell name) of every cell of the
+    scaling study for the interval.
+    """
+    scaling = spec['scaling']
+    if interval not in scaling['intervals']:
+        return []
+
+    return [
+        (variant, schedulers, affinity, '{}-S{}-{}'.format(variant, schedulers, affinity))
+        for variant in scaling['variants']
+        for schedulers in scaling['schedulers']
+        for affinity in scaling['affinities']
+    ]
+
+def buildJob(spec: dict, job: Tuple[dict, int]):
+    """
+    Renders the model of a config and interval once and compiles every variant,
+    which still needs to be measured, in a workspace of its own.
+    Variants with identical sources and compiler options share one build.
+    """
+    config, interval = job
+    results_dir = resultsPath(spec['cache_dir'], config['name'])
+
+    pending_variants = [variant for variant in spec['variants'] if not isCellDone(results_dir, interval, variant)]
+    # Adaptive sampling alternates between both models and saves both cells at
+    # once, so both need to be built even if only one of the cells is missing
+    if 'adaptive' in spec['sampling'] and any(variant in pending_variants for variant in adaptively_sampled_variants):
+        pending_variants += [variant for variant in adaptively_sampled_variants if variant not in pending_variants]
+    if isProfilePending(spec, config, interval):
+        pending_variants += [variant for variant in profiled_variants if variant not in pending_variants]
+    for variant, _, _, cell in scalingCells(spec, interval):
+        if variant not in pending_variants and not isCellDone(results_dir, interval, cell):
+            pending_variants.append(variant)
+    if len(pending_variants) == 0:
+        return config, interval, {}
+
+    workspace_name = '{}-{}'.format(config['name'], interval)
+    sources_dir = createWorkspace(workspace_name, spec['model']['files'])
+    renderModel(spec, {**config['parameters'], spec['interval']: interval}, sources_dir)
+
+    builds = {}
+    variant_dirs = {}
+    for variant in pending_variants:
+        variant_spec = spec['variants'][variant]
+        compile_options = {
+                'logSchedulerCalls': variant_spec.get('log_scheduler_calls', []),
+                'logActivationDelay': variant_spec.get('log_activation_delay', []),
+                'no_static_checks': {**config['flags'], **variant_spec.get('flags', {})}.get('no_static_checks', False)
+            }
+        build_id = repr((variant_spec['sources'], sorted(compile_options.items())))
+
+        if build_id not in builds:
+            builds[build_id] = createWorkspace(
+                    '{}-{}'.format(workspace_name, variant),
+                    [os.path.join(sources_dir, source) for source in variant_spec['sources']]
+                )
+
+            compileModel(
+                    variant_spec['sources'],
+                    use_cache=True,
+                    working_dir=builds[build_id],
+                    cores=spec['execution'].get('compile_cores'),
+                    **compile_options
+                )
+
+        variant_dirs[variant] = builds[build_id]
+
+    removeWorkspace(sources_dir)
+
+    return config, interval, variant_dirs
+
+def buildStartupBaseline(spec: dict) -> str:
+    """
+    Compiles a model which does nothing but printing a line, like the plain
+    variants, and returns the command to run it.
+    """
+    workspace = createWorkspace('startup', [startup_model_file])
+    compileModel(
+            [os.path.basename(startup_model_file)],
+            use_cache=True,
+            working_dir=workspace,
+            cores=spec['execution'].get('compile_cores')
+        )
+
+    return os.path.join(workspace, 'gen/erl/run')
+
+def measureJob(spec: dict, measurement_cores, scaling_cores, startup_command, metadata: dict, built_job):
+    config, interval, variant_dirs = built_job
+    if len(variant_dirs) == 0:
+        print('Skipping {} for {}, already measured'.format(config['name'], interval))
+        return
+
+    results_dir = resultsPath(spec['cache_dir'], config['name'])
+    stdouts_file = stdoutsPath(spec['cache_dir'], config['name'])
+    averaging_factor = spec['sampling']['averaging_factor']
+    warmup_runs = spec['sampling']['warmup_runs']
+    memory_sample_interval = spec['sampling'].get('memory_sample_interval')
+    # Every run is killed once it exceeds these, so that a stalled model does
+    # not hold up the rest of the experiment
+    limits = {
+            'timeout': spec['execution']['timeout'] or None,
+            'memory_limit': spec['execution'].get('memory_limit')
+        }
+    def cellMetadata(cores: Optional[Sequence[int]]) -> dict:
+        # The state of the cores may change during a sweep of several hours,
+        # so it is sampled again right before every cell
+        return {**metadata, **volatileMetadata(cores if cores is not None else availableCores())}
+
+    perf_events = None
+    if 'perf_profile' in spec['sampling']:
+        perf_events = perf_profiles[spec['sampling']['perf_profile']]
+    if 'perf_events' in spec['sampling']:
+        perf_events = spec['sampling']['perf_events']
+
+    def command(variant: str) -> str:
+        return os.path.join(variant_dirs[variant], 'gen/erl/run')
+
+    # The startup of the Erlang VM is measured for every interval, so that the
+    # baseline is subject to the same conditions as the variants
+    startup_rows = None
+    if startup_command is not None:
+        measureCell(
+                results_dir,
+                interval,
+                'startup',
+                lambda: measurementRows(
+                    config['name'],
+                    interval,
+                    'startup',
+                    evaluateCommand(averaging_factor, startup_command, cores=measurement_cores, warmup_runs=warmup_runs, **limits),
+                    stdouts_file
+                ),
+                cellMetadata(measurement_cores)
+            )
+        startup_rows = loadCell(results_dir, interval, 'startup')
+
+    def withStartup(rows):
+        return rows if startup_rows is None else subtractStartup(rows, startup_rows)
+
+    def measureVariant(variant: str):
+        if spec['variants'][variant].get('measure', 'command') == 'scheduler_log':
+            scheduler_log = evaluateSchedulerLog(averaging_factor, command(variant), timeout=limits['timeout'])
+            return schedulerLogRows(config['name'], interval, scheduler_log)
+
+        if spec['variants'][variant].get('measure', 'command') == 'outcome':
+            outcome = spec['outcome']
+            if 'sprt' in outcome and len(outcome['patterns']) == 0:
+                outcomes = evaluateOrderSequentially([command(variant)], outcome['expected_order'], outcome['sprt'], cores=measurement_cores, **limits)
+            else:
+                outcomes = evaluateOutcomes(
+                        averaging_factor,
+                        command(variant),
+                        patterns=outcome['patterns'],
+                        expected_order=outcome['expected_order'],
+                        cores=measurement_cores,
+                        **limits
+                    )
+            return outcomeRows(config['name'], interval, variant, outcomes, stdouts_file)
+
+        warm_iterations = spec['sampling'].get('warm_iterations')
+        if warm_iterations is not None:
+            runs = evaluateWarm(averaging_factor, variant_dirs[variant], spec['model']['main_module'], warm_iterations, cores=measurement_cores, **limits)
+            return warmRows(config['name'], interval, variant, runs, stdouts_file)
+
+        evaluation = evaluateCommand(
+                averaging_factor,
+                command(variant),
+                cores=measurement_cores,
+                perf_events=perf_events,
+                memory_sample_interval=memory_sample_interval,
+                warmup_runs=warmup_runs,
+                **limits
+            )
+        return withStartup(measurementRows(config['name'], interval, variant, evaluation, stdouts_file))
+
+    adaptive_sampling = spec['sampling'].get('adaptive')
+    adaptive_variants = []
+    if adaptive_sampling is not None:
+        adaptive_variants = adaptively_sampled_variants
+
+        def measureAdaptive():
+            evaluation_no_enforcement, evaluation_with_enforcement = evaluateAdaptive(
+                    [command('plain')],
+                    [command('enforcement')],
+                    cores=measurement_cores,
+                    perf_events=perf_events,
+                    memory_sample_interval=memory_sample_interval,
+                    warmup_runs=warmup_runs,
+                    **limits,
+                    **adaptive_sampling
+                )
+
+            return {
+                'plain': withStartup(measurementRows(config['name'], interval, 'plain', evaluation_no_enforcement, stdouts_file)),
+                'enforcement': withStartup(measurementRows(config['name'], interval, 'enforcement', evaluation_with_enforcement, stdouts_file))
+            }
+
+        measureCells(results_dir, interval, adaptive_variants, measureAdaptive, cellMetadata(measurement_cores))
+
+    # Drift over time (temperature, frequency, caches) would bias the difference
+    # between variants measured one after another, so their repetitions are
+    # shuffled into a single schedule instead
+    interleaved_variants = []
+    if spec['sampling']['interleave']:
+        interleaved_variants = [
+                variant
+                for variant in variant_dirs
+                if variant not in adaptive_variants and
+                    spec['variants'][variant].get('measure', 'command') == 'command' and
+                    not isCellDone(results_dir, interval, variant)
+            ]
+
+        def measureInterleaved():
+            evaluations = evaluateInterleaved(
+                    averaging_factor,
+                    {variant: [command(variant)] for variant in interleaved_variants},
+                    warmup_runs=warmup_runs,
+                    seed=spec['sampling'].get('seed'),
+                    cores=measurement_cores,
+                    perf_events=perf_events,
+                    memory_sample_interval=memory_sample_interval,
+                    **limits
+                )
+
+            return {
+                variant: withStartup(measurementRows(config['name'], interval, variant, evaluations[variant], stdouts_file))
+                for variant in interleaved_variants
+            }
+
+        if len(interleaved_variants) > 0:
+            measureCells(results_dir, interval, interleaved_variants, measureInterleaved, cellMetadata(measurement_cores))
+
+    for variant in variant_dirs:
+        if variant not in adaptive_variants and variant not in interleaved_variants:
+            measureCell(results_dir, interval, variant, lambda: measureVariant(variant), cellMetadata(measurement_cores))
+
+    def measureScaled(variant: str, schedulers: int, affinity: str, cell: str):
+        # Every run may use several cores, so they are executed one after another.
+        # "compact" restricts the VM to as many cores as it has schedulers,
+        # "all" leaves it all of the scaling cores.
+        repetitions = [
+                runMeasured(
+                    command(variant),
+                    affinity=scaling_cores[:schedulers] if affinity == 'compact' else scaling_cores,
+                    erl_flags='+S {0}:{0}'.format(schedulers),
+                    perf_events=perf_events,
+                    memory_sample_interval=memory_sample_interval,
+                    **limits
+                )
+                for i in range(0, warmup_runs + averaging_factor)
+            ][warmup_runs:]
+        rows = measurementRows(config['name'], interval, cell, aggregateMeasurements(repetitions), stdouts_file)
+
+        return [
+            {**row, 'scaled_variant': variant, 'schedulers': schedulers, 'affinity': affinity}
+            for row in rows
+        ]
+
+    for variant, schedulers, affinity, cell in scalingCells(spec, interval):
+        measureCell(results_dir, interval, cell, lambda: measureScaled(variant, schedulers, affinity, cell), cellMetadata(scaling_cores))
+
+    if isProfilePending(spec, config, interval):
+        profileJob(spec, config, interval, variant_dirs)
+
+    for variant_dir in set(variant_dirs.values()):
+        removeWorkspace(variant_dir)
+
+def overlapsBuilds(compile_cores: Optional[Sequence[int]], measurement_cores: Optional[Sequence[int]]) -> bool:
+    return (
+        compile_cores is not None and
+        measurement_cores is not None and
+        set(compile_cores).isdisjoint(measurement_cores)
+    )
+
+def scalingCores(spec: dict, measurement_cores: Optional[Sequence[int]]) -> List[int]:
+    """
+    The cores of the scaling study. While builds overlap with the measurements,
+    they must not include the compile_cores, since compilations would slow
+    down the runs using them.
+    """
+    compile_cores = spec['execution'].get('compile_cores', [])
+    builds_overlap = overlapsBuilds(spec['execution'].get('compile_cores'), measurement_cores)
+
+    scaling_cores = spec['scaling']['cores']
+    if scaling_cores == 'available':
+        scaling_cores = [core for core in availableCores() if not builds_overlap or core not in compile_cores]
+    elif builds_overlap and not set(scaling_cores).isdisjoint(compile_cores):
+        raise ValueError('The scaling cores {} overlap with the compile_cores {}.'.format(scaling_cores, compile_cores))
+
+    schedulers = spec['scaling']['schedulers']
+    if len(schedulers) > 0 and max(schedulers) > len(scaling_cores):
+        raise ValueError('{} schedulers need as many cores, but only {} are available for scaling: {}.'.format(
+                max(schedulers), len(scaling_cores), scaling_cores
+            ))
+
+    return scaling_cores
+
+def runExperiment(spec: dict):
+    """
+    Measures every variant of every config of the experiment for every interval.
+    If compile_cores and measurement_cores are disjoint, models are built on a
+    pool of compile_workers threads ahead of the measurements, which happen one
+    interval at a time. Otherwise every interval is built right before it is
+    measured.
+    """
+    os.chdir(spec['working_dir'])
+    os.makedirs(spec['cache_dir'], exist_ok=True)
+
+    configs = expandConfigs(spec)
+    updateIndex(
+            os.path.join(spec['cache_dir'], 'index'),
+            [{'name': config['name'], **config['parameters'], **config['flags']} for config in configs]
+        )
+
+    # Configs of the same interval are built one after another, so that
+    # identical builds of different configs are compiled only once and are then
+    # taken from the build cache
+    jobs = [(config, interval) for interval in spec['intervals'] for config in configs]
+
+    execution = spec['execution']
+    measurement_cores = execution.get('measurement_cores')
+    if measurement_cores == 'available':
+        measurement_cores = [core for core in availableCores() if core not in execution.get('compile_cores', [])]
+    if measurement_cores is not None and len(measurement_cores) == 0:
+        raise ValueError('No cores are left for the measurements besides the compile_cores.')
+    scaling_cores = scalingCores(spec, measurement_cores)
+
+    # The environment is checked once before the sweep and recorded with every
+    # row of its results, its volatile state as of the start of every cell
+    metadata = environmentMetadata(measurement_cores if measurement_cores is not None else availableCores())
+    warnings = checkEnvironment(metadata, spec['environment']['max_load'])
+    for warning in warnings:
+        print('Warning: {}'.format(warning))
+    if len(warnings) > 0 and spec['environment']['strict']:
+        raise RuntimeError('The environment is not suited for measurements, see the warnings above.')
+
+    startup_command = None
+    if spec['sampling']['subtract_startup']:
+        startup_command = buildStartupBaseline(spec)
+
+    # Compilations next to the measurements would compete with them for the
+    # cores, so they only overlap if both are restricted to disjoint cores
+    if overlapsBuilds(execution.get('compile_cores'), measurement_cores):
+        built_jobs = parallelMap(
+                jobs,
+                lambda job: buildJob(spec, job),
+                workers=execution['compile_workers'],
+                queue_size=execution['pipeline_depth']
+            )
+    else:
+        print('Building and measuring one interval after another, since compile_cores and measurement_cores are not disjoint')
+        built_jobs = (buildJob(spec, job) for job in jobs)
+    for built_job in built_jobs:
+        measureJob(spec, measurement_cores, scaling_cores, startup_command, metadata, built_job)
+
+    print('Saved results')
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import re
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from statistics import mean
+from typing import Tuple, Dict, Sequence
+from evaluation_lib.lev_distance import levMany
+
+# Invocation traces are represented by two integer arrays of the same length:
+# The id of each invoked method (the n in "mn") and the iteration it has been
+# invoked in.
+Invocations = Tuple[np.ndarray, np.ndarray]
+
+invocation_regex = re.compile("m(?P<method>\\d+)\\((?P<iteration>\\d+)\\)")
+
+def parseInvocations(stdout: str) -> Invocations:
+    matches = invocation_regex.findall(stdout)
+    if len(matches) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    parsed = np.array(matches).astype(np.int64)
+    return parsed[:, 0], parsed[:, 1]
+
+@lru_cache(maxsize=None)
+def expectedSequentialInvocations(num_iterations: int, num_methods: int) -> Invocations:
+    """
+    m0(0), m1(0), ..., m0(1), m1(1), ...
+    The result is cached, do not modify it.
+    """
+    methods = np.tile(np.arange(num_methods, dtype=np.int64), num_iterations)
+    iterations = np.repeat(np.arange(num_iterations, dtype=np.int64), num_methods)
+
+    return methods, iterations
+
+def invocationKeys(invocations: Invocations) -> np.ndarray:
+    # Combines method and iteration into one integer per invocation for comparisons
+    methods, iterations = invocations
+    return (iterations << 20) | methods
+
+def levenshteinFrame(cells: Dict[Tuple[int, str], Sequence[Invocations]], num_methods: int) -> pd.DataFrame:
+    """
+    Computes the mean Levenshtein distances of the observed invocation traces of
+    all (times, variant) cells to the expected sequential order, once comparing
+    method and iteration (sequential) and once only the method (alternating).
+    """
+    rows = {}
+    for (times, variant), observed in cells.items():
+        expected = expectedSequentialInvocations(times, num_methods)
+
+        row = rows.setdefault(times, {})
+        row['{} sequential'.format(variant)] = mean(
+                levMany(invocationKeys(expected), [invocationKeys(invocations) for invocations in observed])
+            )
+        row['{} alternating'.format(variant)] = mean(
+                levMany(expected[0], [methods for methods, _ in observed])
+            )
+        row['sequence length'] = times * num_methods
+
+    return pd.DataFrame.from_dict(rows, orient='index').sort_index()
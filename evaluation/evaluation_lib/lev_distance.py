@@ -1,18 +1,145 @@
 #!/usr/bin/env python3
-from typing import TypeVar, Sequence, Optional
+import numpy as np
+from typing import TypeVar, Sequence, Optional, Iterable, Hashable, Dict, List, Tuple
 
-T = TypeVar('T')
+T = TypeVar('T', bound=Hashable)
 
-def lev(lhs: Sequence[T], rhs: Sequence[T], i: Optional[int] = None, j: Optional[int] = None) -> int:
-    if i is None or j is None:
-        return lev(lhs, rhs, len(lhs), len(rhs))
+def trimCommonAffixes(lhs: Sequence[T], rhs: Sequence[T]) -> Tuple[Sequence[T], Sequence[T]]:
+    # A common prefix or suffix never contributes to the edit distance
+    start = 0
+    while start < len(lhs) and start < len(rhs) and lhs[start] == rhs[start]:
+        start += 1
+
+    lhs_end, rhs_end = len(lhs), len(rhs)
+    while lhs_end > start and rhs_end > start and lhs[lhs_end-1] == rhs[rhs_end-1]:
+        lhs_end -= 1
+        rhs_end -= 1
+
+    return lhs[start:lhs_end], rhs[start:rhs_end]
+
+def fullDistance(lhs: Sequence[T], rhs: Sequence[T]) -> int:
+    # Wagner-Fischer, keeping only two rows over the shorter sequence
+    if len(lhs) < len(rhs):
+        lhs, rhs = rhs, lhs
+
+    previous = list(range(0, len(rhs)+1))
+    current = [0] * (len(rhs)+1)
+    for i in range(1, len(lhs)+1):
+        current[0] = i
+        left = lhs[i-1]
+        for j in range(1, len(rhs)+1):
+            current[j] = min(
+                    previous[j] + 1,
+                    current[j-1] + 1,
+                    previous[j-1] + (1 if left != rhs[j-1] else 0)
+                )
+        previous, current = current, previous
+
+    return previous[len(rhs)]
+
+def vectorizedDistance(lhs: np.ndarray, rhs: np.ndarray) -> int:
+    """
+    Same as fullDistance for integer arrays, but computes each row with numpy.
+    The dependency of a cell on its left neighbour is resolved with a running
+    minimum: current[j] = min over k <= j of (candidate[k] + j - k).
+    """
+    if len(lhs) < len(rhs):
+        lhs, rhs = rhs, lhs
+
+    offsets = np.arange(0, len(rhs)+1)
+    previous = offsets.copy()
+    candidate = np.empty_like(previous)
+    for i in range(1, len(lhs)+1):
+        candidate[0] = i
+        np.minimum(previous[:-1] + (rhs != lhs[i-1]), previous[1:] + 1, out=candidate[1:])
+        previous = np.minimum.accumulate(candidate - offsets) + offsets
+
+    return int(previous[len(rhs)])
+
+def bandedDistance(lhs: Sequence[T], rhs: Sequence[T], max_distance: int) -> int:
+    """
+    Ukkonen's cut-off: Only cells within max_distance of the diagonal can lie on
+    an edit path of at most max_distance edits, so only those are computed.
+    Returns max_distance + 1, if the distance exceeds max_distance.
+    """
+    exceeded = max_distance + 1
+    if abs(len(lhs) - len(rhs)) > max_distance:
+        return exceeded
+
+    if len(lhs) < len(rhs):
+        lhs, rhs = rhs, lhs
+
+    previous = [j if j <= max_distance else exceeded for j in range(0, len(rhs)+1)]
+    current = [exceeded] * (len(rhs)+1)
+    for i in range(1, len(lhs)+1):
+        low = max(1, i - max_distance)
+        high = min(len(rhs), i + max_distance)
+
+        current[low-1] = i if low == 1 else exceeded
+        left = lhs[i-1]
+        row_minimum = current[low-1]
+        for j in range(low, high+1):
+            current[j] = min(
+                    previous[j] + 1,
+                    current[j-1] + 1,
+                    previous[j-1] + (1 if left != rhs[j-1] else 0),
+                    exceeded
+                )
+            row_minimum = min(row_minimum, current[j])
+
+        # the next row reads this cell, which lies outside of the band
+        if high < len(rhs):
+            current[high+1] = exceeded
+
+        if row_minimum >= exceeded:
+            return exceeded
+
+        previous, current = current, previous
+
+    return previous[len(rhs)]
+
+def lev(lhs: Sequence[T], rhs: Sequence[T], max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance of two sequences in O(len(lhs) * len(rhs)) time and
+    O(min(len(lhs), len(rhs))) memory.
+    If the distance is known to be small, pass an upper bound as max_distance
+    to compute only a band around the diagonal. Distances exceeding the bound
+    are reported as max_distance + 1.
+    """
+    lhs, rhs = trimCommonAffixes(lhs, rhs)
+
+    if max_distance is None:
+        return fullDistance(lhs, rhs)
     else:
-        m = min([i, j])
-        if m == 0:
-            return max([i, j])
-        else:
-            return min([
-                    lev(lhs, rhs, i-1, j) + 1,
-                    lev(lhs, rhs, i, j-1) + 1,
-                    lev(lhs, rhs, i-1, j-1) + (1 if lhs[i-1] != rhs[j-1] else 0)
-                ])
+        return bandedDistance(lhs, rhs, max_distance)
+
+def encode(sequence: Iterable[T], symbols: Dict[T, int]) -> np.ndarray:
+    if isinstance(sequence, np.ndarray):
+        sequence = sequence.tolist()
+
+    return np.array([symbols.setdefault(element, len(symbols)) for element in sequence], dtype=np.int64)
+
+def levMany(expected: Sequence[T], observed: Iterable[Sequence[T]], max_distance: Optional[int] = None) -> List[int]:
+    """
+    Levenshtein distances of one expected sequence to many observed ones.
+    Elements are mapped to integers once, so that rows can be computed with
+    numpy, and identical observed sequences are only compared once.
+    """
+    symbols = {}
+    encoded_expected = encode(expected, symbols)
+
+    distances = {}
+    results = []
+    for sequence in observed:
+        encoded = encode(sequence, symbols)
+        key = encoded.tobytes()
+        if key not in distances:
+            lhs, rhs = trimCommonAffixes(encoded_expected, encoded)
+            if max_distance is None:
+                distances[key] = vectorizedDistance(lhs, rhs)
+            else:
+                distances[key] = bandedDistance(lhs, rhs, max_distance)
+
+        results.append(distances[key])
+
+    return results
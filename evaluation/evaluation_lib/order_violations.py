@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import math
+from typing import Sequence, Optional, List
+from evaluation_lib.adaptive import normalQuantile
+from evaluation_lib.evaluate import mapOnCores
+from evaluation_lib.outcomes import runOutcome
+
+# Estimates how often a model violates an intended order of invocations, e.g.
+# when it is run without enforcement. Runs are stopped as soon as the order can be
+# decided from their output, and no more runs are started once a sequential
+# probability ratio test (SPRT) has decided whether the violation rate is low
+# (at most p0) or high (at least p1).
+
+def sprtDecision(violations: int, runs: int, p0: float, p1: float, alpha: float, beta: float) -> Optional[str]:
+    """
+    Wald's SPRT of H0: violation rate <= p0 against H1: violation rate >= p1 with
+    error probabilities alpha (accepting H1 although H0 holds) and beta.
+    Returns 'H0' or 'H1' once one of them is accepted, None if more runs are needed.
+    """
+    log_likelihood_ratio = (
+            violations * math.log(p1 / p0) +
+            (runs - violations) * math.log((1 - p1) / (1 - p0))
+        )
+
+    if log_likelihood_ratio >= math.log((1 - beta) / alpha):
+        return 'H1'
+    if log_likelihood_ratio <= math.log(beta / (1 - alpha)):
+        return 'H0'
+
+    return None
+
+def wilsonInterval(violations: int, runs: int, confidence: float):
+    """
+    Wilson score interval of the violation rate, which, unlike the normal
+    approximation, remains meaningful for rates close to 0 or 1.
+    """
+    z = normalQuantile(0.5 + confidence / 2)
+    rate = violations / runs
+    center = (rate + z**2 / (2 * runs)) / (1 + z**2 / runs)
+    half_width = z * math.sqrt(rate * (1 - rate) / runs + z**2 / (4 * runs**2)) / (1 + z**2 / runs)
+
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+def testOrderViolations(
+        args: Sequence[str],
+        expected_order: Sequence[str],
+        p0: float = 0.05,
+        p1: float = 0.2,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        confidence: float = 0.95,
+        max_runs: int = 100,
+        cores: Optional[Sequence[int]] = None,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[float] = None
+) -> dict:
+    """
+    Runs the command until the SPRT decides or max_runs runs have been
+    conducted. If `cores` is given, one run per core is executed in parallel
+    and the runs of a round are evaluated in the order they have been started.
+
+    Returns the number of completed 'runs', the 'violations' among them, the
+    'violation_rate' with its confidence interval 'violation_rate_ci' (NaN if no
+    run completed), the 'decision' of the SPRT (None if max_runs was reached
+    first) and after how many completed runs it has been made ('decided_after')
+    as well as the result of runOutcome for every run ('outcomes').
+    Runs killed by the watchdog (see runOutcome) and runs which exited without
+    printing all markers, e.g. because the model crashed, are not taken into
+    account by the test, but counted as 'killed' and 'incomplete'.
+    If the test decides within a round of parallel runs, the remaining runs of
+    the round have been conducted already. They are counted in the violation
+    rate, since they are just as valid, but do not change the decision.
+    """
+    outcomes = []
+    violations = 0
+    runs = 0
+    killed = 0
+    incomplete = 0
+    decision = None
+    decided_after = None
+    while decision is None and len(outcomes) < max_runs:
+        round_size = min(len(cores) if cores is not None else 1, max_runs - len(outcomes))
+        if cores is None:
+            round_outcomes = [runOutcome(*args, patterns={}, expected_order=expected_order, timeout=timeout, memory_limit=memory_limit)]
+        else:
+            round_outcomes = mapOnCores(
+                    cores,
+                    range(0, round_size),
+                    lambda _, core: runOutcome(*args, patterns={}, expected_order=expected_order, core=core, timeout=timeout, memory_limit=memory_limit)
+                )
+
+        for outcome in round_outcomes:
+            outcomes.append(outcome)
+            if outcome['killed_by'] is not None:
+                killed += 1
+                continue
+            if outcome['order_violated'] is None:
+                incomplete += 1
+                continue
+
+            runs += 1
+            violations += 1 if outcome['order_violated'] else 0
+
+            if decision is None:
+                decision = sprtDecision(violations, runs, p0, p1, alpha, beta)
+                decided_after = runs if decision is not None else None
+
+    return {
+        'runs': runs,
+        'killed': killed,
+        'incomplete': incomplete,
+        'violations': violations,
+        'violation_rate': violations / runs if runs > 0 else math.nan,
+        'violation_rate_ci': wilsonInterval(violations, runs, confidence) if runs > 0 else (math.nan, math.nan),
+        'decision': decision,
+        'decided_after': decided_after,
+        'outcomes': outcomes
+    }
+
+def evaluateOrderSequentially(args: Sequence[str], expected_order: Sequence[str], sprt: dict, cores: Optional[Sequence[int]] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> List[dict]:
+    """
+    Like evaluateOutcomes for expected_order only, but conducts only as many runs
+    as the SPRT of testOrderViolations needs. Every outcome carries the
+    'summary' of the test.
+    """
+    result = testOrderViolations(args, expected_order, cores=cores, timeout=timeout, memory_limit=memory_limit, **sprt)
+
+    low, high = result['violation_rate_ci']
+    summary = {
+        'completed_runs': result['runs'],
+        'violation_rate': result['violation_rate'],
+        'violation_rate_ci_low': low,
+        'violation_rate_ci_high': high,
+        'decision': result['decision'],
+        'decided_after': result['decided_after'],
+        'killed_runs': result['killed'],
+        'incomplete_runs': result['incomplete']
+    }
+
+    return [{**outcome, 'summary': summary} for outcome in result['outcomes']]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import subprocess
+import time
+from typing import Sequence, Optional, Dict, List
+from evaluation_lib.evaluate import supervisedPreexec, startWatchdog, killSession, killReason, runOnCores
+
+# Functional outcomes of models instead of their performance: how often lines
+# matching some patterns have been printed (e.g. failing postconditions) and
+# whether methods have been invoked in the intended order.
+
+def isViolated(occurrences: Dict[str, int], expected_order: Sequence[str]) -> Optional[bool]:
+    """
+    Whether the markers did not occur in the expected order, None if some of them
+    are missing.
+    """
+    if any(marker not in occurrences for marker in expected_order):
+        return None
+
+    positions = [occurrences[marker] for marker in expected_order]
+
+    return positions != sorted(positions)
+
+def runOutcome(*args, patterns: Dict[str, str], expected_order: Sequence[str], core: Optional[int] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> dict:
+    """
+    Runs the given command and counts the lines of its output containing each
+    of the patterns. If only the order of the markers in expected_order is of
+    interest, i.e. there are no patterns, the command is killed as soon as all
+    markers have been seen and its exit code is None.
+    If the watchdog kills the command for exceeding `timeout` or `memory_limit`,
+    'killed_by' tells why, see startWatchdog.
+    """
+    counts = dict.fromkeys(patterns, 0)
+    occurrences = {}
+    offset = 0
+    lines = []
+    stopped_early = False
+    start = time.monotonic()
+    with subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=supervisedPreexec(core, timeout),
+            start_new_session=True
+        ) as proc:
+        stop_watchdog = None
+        if timeout is not None or memory_limit is not None:
+            stop_watchdog = startWatchdog(proc.pid, timeout, memory_limit, start)
+
+        for line in proc.stdout:
+            line = line.decode(errors='replace')
+            lines.append(line)
+            for name, pattern in patterns.items():
+                if pattern in line:
+                    counts[name] += 1
+            for marker in expected_order:
+                index = line.find(marker)
+                if marker not in occurrences and index >= 0:
+                    occurrences[marker] = offset + index
+            offset += len(line)
+
+            if len(patterns) == 0 and len(expected_order) > 0 and len(occurrences) == len(expected_order):
+                killSession(proc.pid)
+                stopped_early = True
+                break
+
+        killed_by = stop_watchdog() if stop_watchdog is not None else None
+
+    if timeout is not None and not stopped_early:
+        killed_by = killReason(killed_by, proc.returncode)
+
+    return {
+        'exit_code': None if stopped_early or killed_by is not None else proc.returncode,
+        'killed_by': killed_by,
+        'order_violated': isViolated(occurrences, expected_order) if len(expected_order) > 0 else None,
+        'counts': counts,
+        'stdout': ''.join(lines)
+    }
+
+def evaluateOutcomes(
+        times: int,
+        *args,
+        patterns: Dict[str, str],
+        expected_order: Sequence[str],
+        cores: Optional[Sequence[int]] = None,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[float] = None
+) -> List[dict]:
+    """
+    Runs the command `times` times, like evaluateCommand. Runs which time out
+    are outcomes of their own, e.g. of deadlocked models, so all of them are
+    conducted.
+    """
+    if cores is None:
+        return [runOutcome(*args, patterns=patterns, expected_order=expected_order, timeout=timeout, memory_limit=memory_limit) for i in range(0, times)]
+    else:
+        return runOnCores(
+                cores,
+                times,
+                lambda core: runOutcome(*args, patterns=patterns, expected_order=expected_order, core=core, timeout=timeout, memory_limit=memory_limit)
+            )
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Callable, Any
+
+def parallelMap(items: Iterable, function: Callable[[Any], Any], workers: int = 1, queue_size: int = 1) -> Iterator:
+    """
+    Applies function to up to workers items at the same time on a thread pool,
+    while the consumer processes the results of earlier items. Results are
+    yielded in the order of the items and at most queue_size of them wait for
+    the consumer, which bounds how many items are in flight (e.g. how many
+    compiled models occupy disk space). Exceptions of function are raised there,
+    too.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= workers + queue_size:
+                yield pending.popleft().result()
+
+        while len(pending) > 0:
+            yield pending.popleft().result()
@@ -5,7 +5,7 @@ import numpy as np
 
 plt.close('all')
 
-from evaluate import evaluateCommand
+from evaluation_lib.results_store import cellMeans, memoryTimeline, scalingCurves
 
 def measurementsToDataFrame(measurements):
     indices = [x[0] for x in measurements]
@@ -19,3 +19,141 @@ def measurementsToDataFrame(measurements):
 def barChart(dataframe):
     dataframe.plot.bar()
     plt.show()
+
+# Figures shared by the viewers of the performance experiments. Every function
+# returns the figures which the given results have data for, described by dicts
+# like the ones of the viewers: name, frame, ylabel, xlabel and optionally a
+# customplot.
+
+def relativeIncreaseFrame(frame: pd.DataFrame) -> pd.DataFrame:
+    delta_frame = (
+            ((frame['enforcement'] - frame['plain']) / frame['plain']) * 100
+        ).to_frame('relative increase')
+    delta_frame.index.name = 'repetitions'
+
+    return delta_frame
+
+def startupFigures(results: pd.DataFrame):
+    if 'execution_user' not in results.columns:
+        return []
+
+    # Execution times without the startup of the Erlang VM, which is measured
+    # separately with a model that does nothing
+    execution_times_frame = cellMeans(results, 'execution_user')
+    execution_times_frame['startup'] = results[results['variant'] == 'startup'].groupby('times')['user'].mean()
+    execution_times_frame.index.name = 'repetitions'
+    execution_times_fig = {
+            'name': 'ExecutionUserTimes',
+            'frame': execution_times_frame,
+            'ylabel': 'user mode execution time [s]',
+            'xlabel': 'repetitions'
+        }
+
+    delta_execution_times_fig = {
+            'name': 'DeltaExecutionUserTimes',
+            'frame': relativeIncreaseFrame(execution_times_frame),
+            'ylabel': 'relative increase [%]',
+            'xlabel': 'repetitions'
+        }
+
+    return [execution_times_fig, delta_execution_times_fig]
+
+def warmFigures(results: pd.DataFrame):
+    if 'reductions' not in results.columns:
+        return []
+
+    # Iterations within an already running Erlang VM, i.e. all but the first one
+    warm_results = results[results['iteration'] > 0]
+
+    warm_times_frame = cellMeans(warm_results, 'real')
+    warm_times_frame.index.name = 'repetitions'
+    warm_times_fig = {
+            'name': 'WarmTimes',
+            'frame': warm_times_frame,
+            'ylabel': 'wall clock time per warm iteration [s]',
+            'xlabel': 'repetitions'
+        }
+
+    warm_reductions_frame = cellMeans(warm_results, 'reductions')
+    warm_reductions_frame.index.name = 'repetitions'
+    warm_reductions_fig = {
+            'name': 'WarmReductions',
+            'frame': warm_reductions_frame,
+            'ylabel': 'reductions per warm iteration',
+            'xlabel': 'repetitions'
+        }
+
+    return [warm_times_fig, warm_reductions_fig]
+
+def memoryTimelineFigures(results: pd.DataFrame):
+    if 'memory_rss' not in results.columns:
+        return []
+
+    # Memory usage over time during the largest interval, since it runs longest
+    sampled_results = results[
+            results['memory_rss'].map(lambda values: hasattr(values, '__len__') and len(values) > 0) &
+            results['variant'].isin(['plain', 'enforcement'])
+        ]
+    timeline_times = sampled_results['times'].max()
+
+    memory_timeline_fig = {
+            'name': 'MemoryOverTime',
+            'frame': memoryTimeline(sampled_results, timeline_times, 'rss'),
+            'ylabel': 'memory resident set size [KB]',
+            'xlabel': 'time [s] ({} repetitions)'.format(timeline_times),
+            'customplot': lambda frame: frame.interpolate(method='index', limit_area='inside').plot()
+        }
+
+    anonymous_memory_timeline_fig = {
+            'name': 'AnonymousMemoryOverTime',
+            'frame': memoryTimeline(sampled_results, timeline_times, 'anon'),
+            'ylabel': 'anonymous memory [KB]',
+            'xlabel': 'time [s] ({} repetitions)'.format(timeline_times),
+            'customplot': lambda frame: frame.interpolate(method='index', limit_area='inside').plot()
+        }
+
+    return [memory_timeline_fig, anonymous_memory_timeline_fig]
+
+def counterFigures(results: pd.DataFrame):
+    if 'counter_instructions' not in results.columns or 'counter_cycles' not in results.columns:
+        return []
+
+    results = results.assign(ipc=results['counter_instructions'] / results['counter_cycles'])
+    ipc_frame = cellMeans(results, 'ipc')
+    ipc_frame.index.name = 'repetitions'
+    ipc_fig = {
+            'name': 'InstructionsPerCycle',
+            'frame': ipc_frame,
+            'ylabel': 'instructions per cycle',
+            'xlabel': 'repetitions'
+        }
+
+    return [ipc_fig]
+
+def scalingFigures(results: pd.DataFrame):
+    if 'schedulers' not in results.columns:
+        return []
+
+    # Scaling study over the number of schedulers of the Erlang VM. Enforcement
+    # serializes work if its speedup lags behind the one of the plain model.
+    speedup_frame, efficiency_frame = scalingCurves(results, 'real')
+    speedup_frame['ideal'] = speedup_frame.index / speedup_frame.index.min()
+    scaling_times = results[results['schedulers'].notna()]['times'].max()
+
+    speedup_fig = {
+            'name': 'SpeedUp',
+            'frame': speedup_frame,
+            'ylabel': 'speedup in wall clock time',
+            'xlabel': 'schedulers ({} repetitions)'.format(scaling_times),
+            'customplot': lambda frame: frame.plot(marker='o')
+        }
+
+    efficiency_fig = {
+            'name': 'Efficiency',
+            'frame': efficiency_frame,
+            'ylabel': 'parallel efficiency',
+            'xlabel': 'schedulers ({} repetitions)'.format(scaling_times),
+            'customplot': lambda frame: frame.plot(marker='o')
+        }
+
+    return [speedup_fig, efficiency_fig]
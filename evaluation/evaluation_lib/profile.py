@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+import collections
+import os
+import subprocess
+import tempfile
+import time
+from typing import Sequence, Dict, Tuple, Optional
+import matplotlib.pyplot as plt
+import matplotlib.patches as patches
+from evaluation_lib.environment import erlangVersion
+from evaluation_lib.evaluate import erlEnvironment, supervisedPreexec, startWatchdog, killReason
+
+# Samples call stacks of a model with perf record and turns them into folded
+# stacks ("frame;frame;frame count" per line, as used by flamegraph.pl) and
+# differential flamegraphs of the enforced against the plain model.
+
+# Lets the Erlang VM write a perf map of JIT-compiled code, so that perf can
+# name the Erlang functions. Older VMs have no JIT and refuse to start with it.
+perf_map_erl_flags = '+JPperf true'
+perf_map_otp_release = 24
+
+def defaultErlFlags() -> Optional[str]:
+    """
+    perf_map_erl_flags if the installed Erlang VM supports them, None otherwise.
+    """
+    version = erlangVersion()
+    if version is None or not version.split()[0].isdigit():
+        return None
+
+    return perf_map_erl_flags if int(version.split()[0]) >= perf_map_otp_release else None
+
+def recordStacks(args: Sequence[str], frequency: int = 999, erl_flags: Optional[str] = None, working_dir: str = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Runs the command under perf record and returns the sampled stacks in the
+    text format of perf script, and None.
+    If `timeout` [s] or `memory_limit` [KB] are given, perf and the command are
+    killed when exceeding them, see evaluation_lib.evaluate.startWatchdog. The
+    stacks are incomplete then, so only None and why the command has been
+    killed are returned.
+    Raises a RuntimeError if perf or the command fails.
+    """
+    supervised = timeout is not None or memory_limit is not None
+
+    with tempfile.NamedTemporaryFile(prefix='perf', suffix='.data') as perf_data:
+        start = time.monotonic()
+        record = subprocess.Popen(
+                ['perf', 'record', '-F', str(frequency), '-g', '-o', perf_data.name, '--', *args],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                preexec_fn=supervisedPreexec(None, timeout),
+                cwd=working_dir,
+                env=erlEnvironment(erl_flags),
+                start_new_session=supervised
+            )
+        stop_watchdog = None
+        if supervised:
+            stop_watchdog = startWatchdog(record.pid, timeout, memory_limit, start)
+        _, record_stderr = record.communicate()
+        killed_by = killReason(stop_watchdog(), record.returncode) if stop_watchdog is not None else None
+        if killed_by is not None:
+            return None, killed_by
+
+        if record.returncode != 0:
+            raise RuntimeError('perf record of {} failed with exit code {}:\n{}'.format(
+                    ' '.join(args), record.returncode, record_stderr.decode(errors='replace')
+                ))
+
+        script = subprocess.run(
+                ['perf', 'script', '-i', perf_data.name],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        if script.returncode != 0:
+            raise RuntimeError('perf script failed with exit code {}:\n{}'.format(
+                    script.returncode, script.stderr.decode(errors='replace')
+                ))
+
+    return script.stdout.decode(errors='replace'), None
+
+def frameName(line: str) -> str:
+    # Frames look like "7f12ab symbol+0x1f (/path/to/dso)"
+    _, _, rest = line.strip().partition(' ')
+    symbol, _, dso = rest.rpartition(' (')
+    if symbol == '' or symbol == '[unknown]':
+        return os.path.basename(dso.rstrip(')')) or '[unknown]'
+
+    return symbol.split('+0x')[0]
+
+def foldStacks(perf_script: str) -> Dict[str, int]:
+    """
+    Counts how often every call stack has been sampled. Stacks are rooted at
+    the name of the sampled thread.
+    """
+    folded = collections.Counter()
+    thread, frames = None, []
+    for line in perf_script.splitlines() + ['']:
+        if line.strip() == '':
+            if thread is not None:
+                folded[';'.join([thread, *reversed(frames)])] += 1
+            thread, frames = None, []
+        elif line[0].isspace():
+            frames.append(frameName(line))
+        elif thread is None:
+            thread = line.split()[0]
+
+    return dict(folded)
+
+def saveFolded(path: str, folded: Dict[str, int]):
+    with open(path, 'w') as folded_file:
+        for stack, count in sorted(folded.items()):
+            folded_file.write('{} {}\n'.format(stack, count))
+
+def loadFolded(path: str) -> Dict[str, int]:
+    folded = {}
+    with open(path) as folded_file:
+        for line in folded_file:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            folded[stack] = int(count)
+
+    return folded
+
+def diffFolded(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, Tuple[int, int]]:
+    """
+    Pairs the counts of both profiles per stack, like difffolded.pl.
+    """
+    return {
+        stack: (before.get(stack, 0), after.get(stack, 0))
+        for stack in sorted(set(before) | set(after))
+    }
+
+def saveDiffFolded(path: str, diff: Dict[str, Tuple[int, int]]):
+    with open(path, 'w') as diff_file:
+        for stack, (before, after) in diff.items():
+            diff_file.write('{} {} {}\n'.format(stack, before, after))
+
+def plotDiffFlamegraph(diff: Dict[str, Tuple[int, int]], title: str):
+    """
+    Draws a flamegraph of the second profile of diff, i.e. the widths of the
+    frames correspond to the samples of the enforced model.
+    Frames are colored red if they have been sampled more often than in the
+    plain model (relative to the total number of samples), blue if less often.
+    """
+    def node():
+        return {'before': 0, 'after': 0, 'children': collections.OrderedDict()}
+
+    root = node()
+    for stack, (before, after) in diff.items():
+        current = root
+        current['before'] += before
+        current['after'] += after
+        for frame in stack.split(';'):
+            current = current['children'].setdefault(frame, node())
+            current['before'] += before
+            current['after'] += after
+
+    if root['after'] == 0:
+        return None
+
+    scale = root['after'] / root['before'] if root['before'] > 0 else 0
+
+    fig, ax = plt.subplots(figsize=(16, 9))
+    max_depth = [0]
+
+    def draw(name: str, current: dict, x: float, depth: int):
+        width = current['after'] / root['after']
+        if width <= 0:
+            return
+
+        change = (current['after'] - current['before'] * scale) / current['after']
+        color = (1, 1 - max(change, 0), 1 - max(change, 0)) if change >= 0 else (1 + change, 1 + change, 1)
+        ax.add_patch(patches.Rectangle((x, depth), width, 1, facecolor=color, edgecolor='white', linewidth=0.2))
+        if width > 0.02:
+            ax.text(x + 0.002, depth + 0.5, name, va='center', fontsize=5, clip_on=True)
+
+        max_depth[0] = max(max_depth[0], depth + 1)
+        for child_name, child in current['children'].items():
+            draw(child_name, child, x, depth + 1)
+            x += child['after'] / root['after']
+
+    x = 0
+    for name, child in root['children'].items():
+        draw(name, child, x, 0)
+        x += child['after'] / root['after']
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, max_depth[0])
+    ax.set_xlabel('share of samples of the enforced model')
+    ax.set_ylabel('stack depth')
+    ax.set_title(title)
+
+    return fig
+
+def saveDiffFlamegraph(path: str, diff: Dict[str, Tuple[int, int]], title: str):
+    fig = plotDiffFlamegraph(diff, title)
+    if fig is None:
+        raise ValueError('There are no samples of the enforced model to draw for {}.'.format(title))
+
+    fig.savefig(path)
+    plt.close(fig)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+from typing import List
+
+# Synthetic protocols of configurable size for benchmarking the SDS-tool itself.
+# A coordinator P first starts every participant W0, W1, ... and then calls
+# their methods in nested loops. Every loop corresponds to a repetition in the
+# global type and the innermost one ends with a branch, which participant W0
+# decides on by the value it returns.
+
+def generateProtocol(participants: int = 1, methods: int = 1, depth: int = 0, branching_width: int = 0, releases: int = 0, iterations: int = 2) -> dict:
+    """
+    Describes a protocol where P calls the method start of every one of the
+    `participants` participants and then `methods` methods on every nesting
+    level of `depth` nested repetitions, distributed round-robin among the
+    participants. Thus every participant adds an interaction, even if there are
+    fewer methods than participants.
+    The first `releases` of the latter calls are awaited by P, i.e. followed by
+    Rel(P, ...).
+    """
+    workers = [
+            {
+                'name': 'W{}'.format(index),
+                'ref': 'w{}'.format(index),
+                'methods': [],
+                'chooses': False
+            }
+            for index in range(0, participants)
+        ]
+
+    def call(worker_index: int, method: str, future: str, release: bool) -> dict:
+        worker = workers[worker_index % participants]
+        worker['methods'].append(method)
+
+        return {
+            'participant': worker['name'],
+            'ref': worker['ref'],
+            'method': method,
+            'future': future,
+            'release': release
+        }
+
+    levels = []
+    call_index = 0
+    for level in range(0, depth + 1):
+        calls = []
+        if level == 0:
+            calls = [
+                    call(index, 'start', 'fS{}'.format(index), False)
+                    for index in range(0, participants)
+                ]
+        for index in range(0, methods):
+            calls.append(call(
+                    call_index,
+                    'm{}_{}'.format(level, index),
+                    'f{}_{}'.format(level, index),
+                    call_index < releases
+                ))
+            call_index += 1
+
+        levels.append({
+            'calls': calls,
+            'counter': 'i{}'.format(level)
+        })
+
+    branches = []
+    if branching_width > 0:
+        workers[0]['chooses'] = True
+        branches = [
+                dict(
+                    constructor='C{}'.format(index),
+                    **call(index + 1, 'b{}'.format(index), 'fB{}'.format(index), False)
+                )
+                for index in range(0, branching_width)
+            ]
+
+    return {
+        'participants': workers,
+        'levels': levels,
+        'branches': branches,
+        'iterations': iterations
+    }
+
+def callActions(call: dict) -> List[str]:
+    actions = ['P -{}-> {}:{}'.format(call['future'], call['participant'], call['method'])]
+    if call['release']:
+        actions.append('Rel(P, {})'.format(call['future']))
+    actions.append('{} resolves {}'.format(call['participant'], call['future']))
+
+    return actions
+
+def branchActions(protocol: dict) -> List[str]:
+    chooser = protocol['participants'][0]['name']
+    options = [
+            '.\n'.join([
+                '{} resolves fChoice with {}'.format(chooser, branch['constructor']),
+                'P fetches fChoice as {}'.format(branch['constructor']),
+                *callActions(branch)
+            ])
+            for branch in protocol['branches']
+        ]
+
+    return [
+        'P -fChoice-> {}:choose'.format(chooser),
+        'Rel(P, fChoice)',
+        '{} {{\n{}\n}}'.format(chooser, ',\n'.join(options))
+    ]
+
+def levelType(protocol: dict, level: int) -> str:
+    actions = sum([callActions(call) for call in protocol['levels'][level]['calls']], [])
+    if level + 1 < len(protocol['levels']):
+        actions.append('(\n{}\n)*'.format(levelType(protocol, level + 1)))
+    elif len(protocol['branches']) > 0:
+        actions += branchActions(protocol)
+
+    return '.\n'.join(actions)
+
+def globalType(protocol: dict) -> str:
+    return '0 -f-> P:run.\n{}.\nP resolves f\n'.format(levelType(protocol, 0))
+
+def protocolSize(protocol: dict) -> dict:
+    """
+    Counts the actions of the global type, which are relevant for its size.
+    """
+    calls = sum([level['calls'] for level in protocol['levels']], []) + protocol['branches']
+
+    return {
+        'interactions': len(calls) + (1 if len(protocol['branches']) > 0 else 0),
+        'releases': len([call for call in calls if call['release']]) + (1 if len(protocol['branches']) > 0 else 0),
+        'resolutions': len(calls) + len(protocol['branches'])
+    }
@@ -1,17 +1,37 @@
 #!/usr/bin/env python3
+import functools
 import jinja2
 import os
 
-def renderTemplate(filePath: str, targetPath: str, env: dict):
-    dirpath = os.path.dirname(filePath)
+@functools.lru_cache(maxsize=None)
+def templateEnvironment(dirpath: str) -> jinja2.Environment:
+    # The environment caches compiled templates, so every template is only
+    # parsed once per process (and again if its file changes)
+    templateLoader = jinja2.FileSystemLoader(searchpath=dirpath)
+    return jinja2.Environment(loader=templateLoader)
+
+def renderToString(filePath: str, env: dict) -> str:
+    dirpath = os.path.abspath(os.path.dirname(filePath))
     filename = os.path.basename(filePath)
 
-    templateLoader = jinja2.FileSystemLoader(searchpath=dirpath)
-    templateEnv = jinja2.Environment(loader=templateLoader)
-    template = templateEnv.get_template(filename)
+    template = templateEnvironment(dirpath).get_template(filename)
+
+    return template.render(env)
+
+def renderTemplate(filePath: str, targetPath: str, env: dict) -> bool:
+    """
+    Renders the template to targetPath, but leaves the file (and its
+    modification time) untouched if it already has the rendered content.
+    Returns whether the file has been written.
+    """
+    result = renderToString(filePath, env)
+
+    if os.path.exists(targetPath):
+        with open(targetPath, "r") as targetFile:
+            if targetFile.read() == result:
+                return False
 
-    result = template.render(env)
+    with open(targetPath, "w") as targetFile:
+        targetFile.write(result)
 
-    targetFile = open(targetPath, "w")
-    targetFile.write(result)
-    targetFile.close()
+    return True
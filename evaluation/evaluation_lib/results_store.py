@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+import glob
+import mmap
+import os
+import pickle
+import zlib
+import pandas as pd
+from contextlib import contextmanager
+from typing import Sequence, Optional, List, Tuple, Iterator, Callable, Dict
+
+# Results are stored as one row per (config, times, variant, repetition) with flat
+# numeric columns. Every (times, variant) cell is written to its own Parquet file
+# within the results directory of a config as soon as it has been measured, so
+# that interrupted sweeps can be resumed and extended.
+# The raw outputs of the model are kept out of it in a separate blob file of
+# zlib compressed stdouts, which the rows point to.
+
+metric_columns = ['real', 'user', 'sys', 'maximum_rss', 'exit_code', 'core', 'first_output', 'killed_by']
+# Statistics over all repetitions of a cell, which some evaluation modes provide
+summary_columns = ['relative_overhead', 'relative_overhead_ci']
+counter_prefix = 'counter_'
+# Time series of memory usage, stored as list columns per repetition
+memory_prefix = 'memory_'
+# Numbers of output lines matching the patterns of an outcome experiment
+outcome_prefix = 'outcome_'
+# Times which are split into startup of the Erlang VM and execution of the model,
+# if a startup baseline is measured
+startup_metrics = ['real', 'user', 'sys']
+
+def resultsPath(cache_dir: str, name: str) -> str:
+    return os.path.join(cache_dir, '{}.results'.format(name))
+
+def stdoutsPath(cache_dir: str, name: str) -> str:
+    return os.path.join(cache_dir, '{}.stdouts'.format(name))
+
+def appendStdouts(path: str, stdouts: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    Appends compressed stdouts to the blob file at path and returns the offset
+    and length of each of them within the file.
+    """
+    locations = []
+    with open(path, 'ab') as blob_file:
+        for stdout in stdouts:
+            blob = zlib.compress(stdout.encode())
+            locations.append((blob_file.tell(), len(blob)))
+            blob_file.write(blob)
+
+    return locations
+
+@contextmanager
+def openStdouts(path: str) -> Iterator[mmap.mmap]:
+    with open(path, 'rb') as blob_file:
+        if os.fstat(blob_file.fileno()).st_size == 0:
+            yield b''
+            return
+
+        blobs = mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield blobs
+        finally:
+            blobs.close()
+
+def readStdout(blobs, offset: int, length: int) -> str:
+    offset, length = int(offset), int(length) # stored as floats in columns with missing values
+    return zlib.decompress(blobs[offset:offset+length]).decode()
+
+def measurementRows(config: str, times: int, variant: str, evaluation: dict, stdouts_path: str) -> List[dict]:
+    """
+    Flattens the result of evaluateCommand into one row per repetition.
+    """
+    locations = appendStdouts(stdouts_path, evaluation['stdouts'])
+
+    rows = []
+    for repetition, (sample, (offset, length)) in enumerate(zip(evaluation['samples'], locations)):
+        row = {
+            'config': config,
+            'times': times,
+            'variant': variant,
+            'repetition': repetition,
+            'stdout_offset': offset,
+            'stdout_length': length
+        }
+        row.update({column: sample[column] for column in metric_columns})
+        row.update({column: evaluation[column] for column in summary_columns if column in evaluation})
+        if 'run_order' in evaluation:
+            # Position in the randomized schedule of evaluateInterleaved
+            row['run_order'] = evaluation['run_order'][repetition]
+        row.update({
+            counter_prefix + event: value
+            for event, value in sample['counters'].items()
+        })
+        if sample['memory'] is not None:
+            row.update({
+                memory_prefix + field: values
+                for field, values in sample['memory'].items()
+            })
+        rows.append(row)
+
+    return rows
+
+def warmRows(config: str, times: int, variant: str, runs: Sequence[tuple], stdouts_path: str) -> List[dict]:
+    """
+    Flattens the result of evaluateWarm into one row per iteration of every VM.
+    real, cpu and reductions are measured per iteration, while user, sys and
+    maximum_rss are the ones of the whole VM (and its wall clock time vm_real).
+    """
+    rows = []
+    for repetition, (measurement, iterations) in enumerate(runs):
+        locations = appendStdouts(stdouts_path, [iteration['stdout'] for iteration in iterations])
+
+        for iteration, (offset, length) in zip(iterations, locations):
+            rows.append({
+                'config': config,
+                'times': times,
+                'variant': variant,
+                'repetition': repetition,
+                'iteration': iteration['iteration'],
+                'stdout_offset': offset,
+                'stdout_length': length,
+                'real': iteration['real'],
+                'cpu': iteration['cpu'],
+                'reductions': iteration['reductions'],
+                'vm_real': measurement.real,
+                'user': measurement.user,
+                'sys': measurement.sys,
+                'maximum_rss': measurement.maximum_rss,
+                'exit_code': measurement.exit_code,
+                'core': measurement.core,
+                'killed_by': measurement.killed_by
+            })
+
+    return rows
+
+def outcomeRows(config: str, times: int, variant: str, outcomes: Sequence[dict], stdouts_path: str) -> List[dict]:
+    """
+    Flattens the result of evaluateOutcomes into one row per run.
+    """
+    locations = appendStdouts(stdouts_path, [outcome['stdout'] for outcome in outcomes])
+
+    rows = []
+    for repetition, (outcome, (offset, length)) in enumerate(zip(outcomes, locations)):
+        row = {
+            'config': config,
+            'times': times,
+            'variant': variant,
+            'repetition': repetition,
+            'stdout_offset': offset,
+            'stdout_length': length,
+            'exit_code': outcome['exit_code'],
+            'killed_by': outcome['killed_by'],
+            'order_violated': outcome['order_violated']
+        }
+        row.update({
+            outcome_prefix + name: count
+            for name, count in outcome['counts'].items()
+        })
+        row.update(outcome.get('summary', {}))
+        rows.append(row)
+
+    return rows
+
+def subtractStartup(rows: Sequence[dict], startup_rows: Sequence[dict]) -> List[dict]:
+    """
+    Adds the mean startup times of the baseline model and the remaining
+    execution times to every row.
+    """
+    startup_columns = {}
+    for column in startup_metrics:
+        startup_columns['startup_' + column] = sum(row[column] for row in startup_rows) / len(startup_rows)
+
+    return [
+        {
+            **row,
+            **startup_columns,
+            **{
+                'execution_' + column: row[column] - startup_columns['startup_' + column]
+                for column in startup_metrics
+            }
+        }
+        for row in rows
+    ]
+
+def schedulerLogRows(config: str, times: int, scheduler_log: dict) -> List[dict]:
+    return [{
+        'config': config,
+        'times': times,
+        'variant': 'scheduler_log',
+        'repetition': 0,
+        'scheduler_calls': scheduler_log['scheduler_calls'],
+        'delays': scheduler_log['delays'],
+        'killed_runs': scheduler_log['killed_runs']
+    }]
+
+def cellPath(results_dir: str, times: int, variant: str) -> str:
+    return os.path.join(results_dir, 'times={}-variant={}.parquet'.format(times, variant))
+
+def isCellDone(results_dir: str, times: int, variant: str) -> bool:
+    return os.path.exists(cellPath(results_dir, times, variant))
+
+def loadCell(results_dir: str, times: int, variant: str) -> List[dict]:
+    return pd.read_parquet(cellPath(results_dir, times, variant)).to_dict('records')
+
+def saveCell(results_dir: str, times: int, variant: str, rows: Sequence[dict]):
+    os.makedirs(results_dir, exist_ok=True)
+
+    # Write to a temporary file first, so that a crash never leaves a cell
+    # behind which looks complete
+    path = cellPath(results_dir, times, variant)
+    staging_path = path + '.tmp'
+    pd.DataFrame(rows).to_parquet(staging_path, index=False)
+    os.replace(staging_path, path)
+
+def measureCell(results_dir: str, times: int, variant: str, measure: Callable[[], Sequence[dict]], metadata: Optional[dict] = None):
+    """
+    Calls measure to obtain the rows of a cell and saves them, unless the cell
+    has already been measured by an earlier run.
+    The columns of metadata, e.g. describing the environment, are added to every
+    row.
+    """
+    measureCells(results_dir, times, [variant], lambda: {variant: measure()}, metadata)
+
+def measureCells(results_dir: str, times: int, variants: Sequence[str], measure: Callable[[], Dict[str, Sequence[dict]]], metadata: Optional[dict] = None):
+    """
+    Like measureCell, for measurements which yield the rows of several variants
+    at once.
+    Measures all of them again, if any of them is missing.
+    """
+    if all(isCellDone(results_dir, times, variant) for variant in variants):
+        print('Skipping {} for {}, already measured'.format(', '.join(variants), times))
+        return
+
+    for variant, rows in measure().items():
+        saveCell(results_dir, times, variant, [{**row, **(metadata or {})} for row in rows])
+
+def loadResults(results_dir: str, columns: Sequence[str] = None) -> pd.DataFrame:
+    # Cells may have different columns (e.g. scheduler logs or perf counters),
+    # so they are read separately instead of as one dataset
+    cells = [
+            pd.read_parquet(path)
+            for path in sorted(glob.glob(os.path.join(results_dir, '*.parquet')))
+        ]
+    results = pd.concat(cells, ignore_index=True, sort=False)
+
+    if columns is not None:
+        results = results.reindex(columns=columns)
+
+    return results
+
+def updateIndex(index_path: str, run_configs: Sequence[dict]) -> List[dict]:
+    """
+    Adds configs to the index of an experiment, which are not already listed in
+    it, and returns the new index.
+    """
+    index = []
+    if os.path.exists(index_path):
+        with open(index_path, 'rb') as index_file:
+            index = pickle.load(index_file)
+
+    known_names = {run_config['name'] for run_config in index}
+    index += [run_config for run_config in run_configs if run_config['name'] not in known_names]
+
+    with open(index_path, 'wb') as index_file:
+        pickle.dump(index, index_file)
+
+    return index
+
+def cellMeans(results: pd.DataFrame, metric: str, variants: Sequence[str] = ['plain', 'enforcement']) -> pd.DataFrame:
+    """
+    Averages a metric over all repetitions of a cell, one row per interval and one
+    column per variant. Repetitions killed by the watchdog are left out.
+    """
+    if 'killed_by' in results.columns:
+        results = results[results['killed_by'].isna()]
+
+    frame = results[results['variant'].isin(variants)] \
+        .groupby(['times', 'variant'])[metric] \
+        .mean() \
+        .unstack('variant')[list(variants)]
+    frame.columns.name = None
+
+    return frame
+
+def memoryTimeline(results: pd.DataFrame, times: int, field: str = 'rss', variants: Sequence[str] = ['plain', 'enforcement']) -> pd.DataFrame:
+    """
+    Memory usage over time during the first repetition of a cell, one column per
+    variant. The variants have been sampled at different points in time, so every
+    column is only defined at its own sampling times.
+    """
+    series = []
+    for variant in variants:
+        cell = results[(results['times'] == times) & (results['variant'] == variant)]
+        first_repetition = cell.sort_values('repetition').iloc[0]
+        series.append(pd.Series(
+                list(first_repetition[memory_prefix + field]),
+                index=list(first_repetition[memory_prefix + 'time']),
+                name=variant
+            ))
+
+    frame = pd.concat(series, axis=1).sort_index()
+    frame.index.name = 'time'
+
+    return frame
+
+def outcomeSummary(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Number of runs per cell, how many of them violated the expected order,
+    how many printed each of the outcome patterns at least once and how many
+    have been killed by the watchdog.
+    """
+    results = results.copy()
+    aggregations = {'runs': ('repetition', 'count')}
+    if 'killed_by' in results.columns:
+        for reason in ['timeout', 'memory']:
+            results['killed_by_' + reason] = results['killed_by'] == reason
+            aggregations['killed_by_' + reason] = ('killed_by_' + reason, 'sum')
+    if results['order_violated'].notna().any():
+        results['order_violated'] = results['order_violated'].astype(float)
+        aggregations['order_violations'] = ('order_violated', 'sum')
+    for column in results.columns:
+        if column.startswith(outcome_prefix):
+            results[column] = results[column] > 0
+            aggregations[column[len(outcome_prefix):]] = (column, 'sum')
+    for column in ['completed_runs', 'violation_rate', 'violation_rate_ci_low', 'violation_rate_ci_high', 'decision', 'decided_after', 'killed_runs', 'incomplete_runs']:
+        if column in results.columns:
+            aggregations[column] = (column, 'first')
+
+    return results.groupby(['config', 'times', 'variant']).agg(**aggregations)
+
+def scalingCurves(results: pd.DataFrame, metric: str = 'real') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Speedup and parallel efficiency of the scaling cells over the number of
+    schedulers, one column per variant and affinity. Both are relative to the
+    smallest scheduler count that has been measured.
+    """
+    scaled = results[results['schedulers'].notna()]
+    means = scaled \
+        .groupby(['schedulers', 'scaled_variant', 'affinity'])[metric] \
+        .mean() \
+        .unstack(['scaled_variant', 'affinity'])
+    means.columns = ['{} ({})'.format(variant, affinity) for variant, affinity in means.columns]
+    means.index = means.index.astype(int)
+
+    base_schedulers = means.index.min()
+    speedup = means.loc[base_schedulers] / means
+    efficiency = speedup.mul(base_schedulers / means.index.to_series(), axis=0)
+
+    return speedup, efficiency
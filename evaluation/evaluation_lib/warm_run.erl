@@ -0,0 +1,50 @@
+-module(warm_run).
+-export([main/1]).
+
+%% Runs the main block of a compiled ABS model several times within the same
+%% Erlang VM and reports wall clock time, CPU time and reductions of every
+%% iteration, see warm_run.py.
+
+main([Module, Iterations]) ->
+    checkRuntime(),
+    lists:foreach(
+      fun (Iteration) -> iteration(list_to_atom(Module), Iteration) end,
+      lists:seq(0, list_to_integer(Iterations) - 1)),
+    halt(0).
+
+%% The entry point of the ABS runtime is not a stable interface, so rather than
+%% failing with an undef error in the first iteration, we report what we found.
+checkRuntime() ->
+    case code:ensure_loaded(runtime) of
+        {module, runtime} ->
+            case erlang:function_exported(runtime, run_mod, 5) of
+                true -> ok;
+                false ->
+                    Arities = [Arity || {run_mod, Arity} <- runtime:module_info(exports)],
+                    io:format("[warm_run] error runtime:run_mod/5 is not exported, run_mod has arities ~w~n", [Arities]),
+                    halt(2)
+            end;
+        {error, Reason} ->
+            io:format("[warm_run] error the ABS runtime could not be loaded: ~w~n", [Reason]),
+            halt(2)
+    end.
+
+iteration(Module, Iteration) ->
+    io:format("[warm_run] start ~w~n", [Iteration]),
+    erlang:garbage_collect(),
+
+    %% Both statistics report the difference to their last call as second value
+    erlang:statistics(exact_reductions),
+    erlang:statistics(runtime),
+    Start = erlang:monotonic_time(microsecond),
+
+    runtime:run_mod(Module, false, false, none, none),
+
+    Real = erlang:monotonic_time(microsecond) - Start,
+    {_, Reductions} = erlang:statistics(exact_reductions),
+    {_, Cpu} = erlang:statistics(runtime),
+    io:format("[warm_run] end ~w ~w ~w ~w~n", [Iteration, Real, Cpu, Reductions]),
+
+    %% Discard the state of the ABS runtime (clock, cogs, ...), it is started
+    %% again by the next iteration
+    application:stop(absmodel).
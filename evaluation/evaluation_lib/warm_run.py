@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import functools
+import os
+import subprocess
+from typing import Sequence, Optional, List, Tuple
+from evaluation_lib.evaluate import Measurement, runMeasured, runOnCores
+from evaluation_lib.workspace import createWorkspace
+
+# Instead of starting a fresh Erlang VM for every execution of a model, the
+# driver warm_run.erl loads the compiled model once and runs its main block
+# several times. Only the first iteration pays for loading the code.
+
+driver_source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warm_run.erl')
+
+warm_marker = '[warm_run] '
+
+@functools.lru_cache(maxsize=None)
+def compileDriver() -> str:
+    """
+    Compiles warm_run.erl once per process and returns the folder of the beam.
+    """
+    driver_dir = createWorkspace('warm_run')
+    subprocess.run(['erlc', '-o', driver_dir, driver_source], check=True)
+
+    return driver_dir
+
+def erlangModule(abs_module: str) -> str:
+    # The Erlang backend prefixes modules and replaces the dots of qualified names
+    return 'm_' + abs_module.replace('.', '_')
+
+def codePaths(build_dir: str) -> List[str]:
+    """
+    All ebin folders of the compiled model and the ABS runtime.
+    """
+    return sorted(
+            dirpath
+            for dirpath, _, _ in os.walk(os.path.join(build_dir, 'gen/erl'))
+            if os.path.basename(dirpath) == 'ebin'
+        )
+
+def warmCommand(build_dir: str, abs_module: str, iterations: int) -> List[str]:
+    return [
+        'erl', '-noshell', '-noinput',
+        '-pa', compileDriver(), *codePaths(build_dir),
+        '-run', 'warm_run', 'main', erlangModule(abs_module), str(iterations)
+    ]
+
+def parseWarmOutput(stdout: str) -> List[dict]:
+    """
+    Splits the output of the driver into iterations with their own stdout, wall
+    clock time [s], CPU time [s] and reductions.
+    """
+    iterations = []
+    lines = []
+    for line in stdout.splitlines(keepends=True):
+        if not line.startswith(warm_marker):
+            lines.append(line)
+            continue
+
+        fields = line[len(warm_marker):].split()
+        if fields[0] == 'error':
+            raise RuntimeError('The warm run driver failed: {}'.format(line[len(warm_marker) + len('error '):].strip()))
+        elif fields[0] == 'start':
+            lines = []
+        elif fields[0] == 'end':
+            iteration, real, cpu, reductions = map(int, fields[1:])
+            iterations.append({
+                'iteration': iteration,
+                'real': real / 1000000, # microseconds
+                'cpu': cpu / 1000, # milliseconds
+                'reductions': reductions,
+                'stdout': ''.join(lines)
+            })
+
+    return iterations
+
+def runWarm(build_dir: str, abs_module: str, iterations: int, core: Optional[int] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> Tuple[Measurement, List[dict]]:
+    """
+    Runs the model `iterations` times in one Erlang VM.
+    Returns the measurement of the whole VM and the ones of the iterations.
+    """
+    measurement = runMeasured(
+            *warmCommand(build_dir, abs_module, iterations),
+            core=core,
+            working_dir=os.path.join(build_dir, 'gen/erl'),
+            timeout=timeout,
+            memory_limit=memory_limit
+        )
+
+    runs = parseWarmOutput(measurement.stdout)
+    if measurement.killed_by is None and (measurement.exit_code != 0 or len(runs) != iterations):
+        raise RuntimeError(
+                'The warm run of {} completed {} of {} iterations with exit code {}:\n{}'.format(
+                    abs_module, len(runs), iterations, measurement.exit_code, measurement.stdout[-2000:]
+                )
+            )
+
+    return measurement, runs
+
+def evaluateWarm(times: int, build_dir: str, abs_module: str, iterations: int, cores: Optional[Sequence[int]] = None, timeout: Optional[float] = None, memory_limit: Optional[float] = None) -> List[Tuple[Measurement, List[dict]]]:
+    """
+    Starts `times` Erlang VMs, each running the model `iterations` times.
+    Like evaluateCommand, the VMs run in parallel if `cores` is given.
+    """
+    compileDriver()
+    # Fails early, e.g. if the ABS runtime does not provide the entry point the
+    # driver relies on, instead of after all VMs have been started
+    runWarm(build_dir, abs_module, 2, timeout=timeout, memory_limit=memory_limit)
+
+    if cores is None:
+        return [runWarm(build_dir, abs_module, iterations, timeout=timeout, memory_limit=memory_limit) for i in range(0, times)]
+    else:
+        return runOnCores(
+                cores,
+                times,
+                lambda core: runWarm(build_dir, abs_module, iterations, core=core, timeout=timeout, memory_limit=memory_limit)
+            )
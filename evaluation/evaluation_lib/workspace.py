@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Optional, Sequence
+
+workspace_prefix = 'sessiontypeabs-'
+
+def defaultWorkspaceRoot() -> str:
+    """
+    Prefers the RAM-backed /dev/shm, so that neither compilation nor the
+    measured runs have to wait for the disk.
+    """
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+
+    return tempfile.gettempdir()
+
+def processAlive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+def collectWorkspaces(root: str):
+    """
+    Removes the workspaces of experiment processes which are no longer running,
+    e.g. because they have been killed.
+    """
+    for entry in os.listdir(root):
+        if not entry.startswith(workspace_prefix):
+            continue
+
+        pid = entry[len(workspace_prefix):]
+        if pid.isdigit() and int(pid) != os.getpid() and not processAlive(int(pid)):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+_process_dirs = {}
+
+def processDir(root: str) -> str:
+    """
+    Directory holding all workspaces of this process below root. It is removed
+    when the process exits.
+    """
+    if root not in _process_dirs:
+        collectWorkspaces(root)
+
+        process_dir = os.path.join(root, workspace_prefix + str(os.getpid()))
+        os.makedirs(process_dir, exist_ok=True)
+        atexit.register(shutil.rmtree, process_dir, ignore_errors=True)
+
+        _process_dirs[root] = process_dir
+
+    return _process_dirs[root]
+
+def linkFile(source: str, target: str):
+    # Hard links are free, but do not work across file systems, e.g. from the
+    # source folder to /dev/shm. Then we have to fall back to a copy.
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def createWorkspace(name: str, shared_files: Sequence[str] = [], root: Optional[str] = None) -> str:
+    """
+    Creates an empty directory for a single build or run and links the given
+    input files into it.
+    Workspaces with different names can be used concurrently.
+    """
+    if root is None:
+        root = defaultWorkspaceRoot()
+
+    path = os.path.join(processDir(root), name)
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    for shared_file in shared_files:
+        linkFile(shared_file, os.path.join(path, os.path.basename(shared_file)))
+
+    return path
+
+def removeWorkspace(path: str):
+    shutil.rmtree(path, ignore_errors=True)
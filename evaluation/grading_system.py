@@ -1,43 +1,38 @@
 #!/usr/bin/env python3
 
 import os
-from subprocess import run
-from evaluation_lib.compile import compileModel
-
-num_executions = 100
-
-answer = input('Evaluate with enforcement? [Y/N] ')
-
-source_files = ['GradingSystem.abs']
-
-if answer == 'Y':
-    source_files += ['GradingSystem.st']
-elif answer == 'N':
-    pass
-else:
-    print('Cant parse answer.')
-    exit(-1)
-
-os.chdir('models/complex/grading_system')
-
-compileModel(source_files)
-
-fail_count = 0
-success_count = 0
-for i in range(0, num_executions):
-    process = run(['gen/erl/run'], capture_output=True)
-    
-    stdout: str = process.stdout.decode()
-    publishIdx = stdout.find("publish")
-    requestIdx = stdout.find("request")
-
-    if publishIdx < 0 or requestIdx < 0:
-        print("Model did not execute correctly, aborting.")
-        exit(-1)
-
-    if publishIdx < requestIdx:
-        success_count += 1
+import pandas as pd
+from evaluation_lib.experiment import loadExperiment, expandConfigs, runExperiment
+from evaluation_lib.results_store import resultsPath, loadResults, outcomeSummary
+
+spec = loadExperiment('experiments/grading_system.toml')
+runExperiment(spec)
+
+summary = pd.concat([
+        outcomeSummary(loadResults(resultsPath(spec['cache_dir'], config['name'])))
+        for config in expandConfigs(spec)
+    ])
+summary.to_csv(os.path.join(spec['cache_dir'], 'GradingSystem_Outcomes.csv'))
+
+for (config, times, variant), row in summary.iterrows():
+    print('{}: Invocation order failed {} out of {} times ({:.1%}, {:.0%} confidence interval [{:.1%}, {:.1%}]).'.format(
+            variant,
+            int(row['order_violations']),
+            int(row['completed_runs']),
+            row['violation_rate'],
+            spec['outcome']['sprt']['confidence'],
+            row['violation_rate_ci_low'],
+            row['violation_rate_ci_high']
+        ))
+    if row['killed_runs'] > 0 or row['incomplete_runs'] > 0:
+        print('{} runs have been killed and {} did not print all of {}.'.format(
+                int(row['killed_runs']),
+                int(row['incomplete_runs']),
+                ', '.join(spec['outcome']['expected_order'])
+            ))
+    if row['decision'] == 'H0':
+        print('The order is violated in at most {:.0%} of the runs.'.format(spec['outcome']['sprt']['p0']))
+    elif row['decision'] == 'H1':
+        print('The order is violated in at least {:.0%} of the runs.'.format(spec['outcome']['sprt']['p1']))
     else:
-        fail_count += 1
-
-print('Invocation order failed {} out of {} times.'.format(fail_count, num_executions))
+        print('Could not decide within {} runs.'.format(int(row['completed_runs'])))
@@ -1,25 +1,18 @@
 #!/usr/bin/env python3
 
 import os
-import random
-from subprocess import run
-from evaluation_lib.compile import compileModel
-from evaluation_lib.render_template import renderTemplate
+import pandas as pd
+from evaluation_lib.experiment import loadExperiment, expandConfigs, runExperiment
+from evaluation_lib.results_store import resultsPath, loadResults, outcomeSummary
 
-source_files = ['ResponsiveUI.abs', 'ResponsiveUI.st']
-os.chdir('models/complex/responsive_ui')
+spec = loadExperiment('experiments/responsive_ui.toml')
+runExperiment(spec)
 
-set_expect = True if input('Should the expect-flag be set? [Y/N] ') == 'Y' else False
-start_value = int(input('Enter the value "start" shall be called with (use a positive value, if the postcondition shall not fail): '))
+summary = pd.concat([
+        outcomeSummary(loadResults(resultsPath(spec['cache_dir'], config['name'])))
+        for config in expandConfigs(spec)
+    ])
+summary.to_csv(os.path.join(spec['cache_dir'], 'ResponsiveUI_Outcomes.csv'))
 
-renderTemplate(
-    'ResponsiveUI.template.abs',
-    'ResponsiveUI.abs',
-    {
-        'set_expect': set_expect,
-        'start_value': start_value
-    }
-)
-compileModel(source_files)
-
-run(['gen/erl/run'])
+pd.set_option('display.width', None)
+print(summary.rename(columns={'postcondition_failures': 'runs with failing postconditions'}))
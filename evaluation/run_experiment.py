@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+
+import sys
+from evaluation_lib.experiment import loadExperiment, runExperiment
+
+if len(sys.argv) != 2:
+    print('Usage: {} EXPERIMENT.toml'.format(sys.argv[0]))
+    sys.exit(1)
+
+runExperiment(loadExperiment(sys.argv[1]))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from evaluation_lib.build_cache import jar_path
+from evaluation_lib.compile import build_dir, isCompiled, checkCompiled
+from evaluation_lib.compile_server import sdstool_path
+from evaluation_lib.protocol_generator import generateProtocol, globalType
+from evaluation_lib.render_template import renderTemplate
+
+# Run from the evaluation folder with
+#   python3 -m unittest discover tests
+
+protocol_template = os.path.join(os.path.dirname(__file__), '..', 'models', 'complex', 'compile_scaling', 'Protocol.template.abs')
+
+def writeMalformedProtocol(target_dir: str):
+    """
+    A protocol like the ones of compile_scaling.py, whose session type calls a
+    method the model does not have.
+    """
+    protocol = generateProtocol(participants=2, methods=2)
+    renderTemplate(protocol_template, os.path.join(target_dir, 'Protocol.abs'), protocol)
+
+    with open(os.path.join(target_dir, 'Protocol.st'), 'w') as type_file:
+        type_file.write(globalType(protocol).replace(':m0_0.', ':missingMethod.'))
+
+class CheckCompiledTest(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp(prefix='sessiontypeabs-test')
+        writeMalformedProtocol(self.workspace)
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace)
+
+    def test_workspace_without_build_is_rejected(self):
+        self.assertFalse(isCompiled(self.workspace))
+        with self.assertRaises(RuntimeError):
+            checkCompiled(self.workspace, 'error')
+
+    def test_workspace_with_build_is_accepted(self):
+        os.makedirs(os.path.join(self.workspace, build_dir))
+        open(os.path.join(self.workspace, build_dir, 'run'), 'w').close()
+
+        self.assertTrue(isCompiled(self.workspace))
+        checkCompiled(self.workspace)
+
+    @unittest.skipUnless(
+            os.path.exists(jar_path) and shutil.which('java') is not None,
+            'the SDS-tool has not been built with ./gradlew shadowJar'
+        )
+    def test_malformed_protocol_is_rejected(self):
+        compilation = subprocess.run(
+                [sdstool_path, 'compile', 'Protocol.abs', 'Protocol.st'],
+                cwd=self.workspace,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+
+        # The exit code does not tell, see isCompiled
+        with self.assertRaises(RuntimeError):
+            checkCompiled(self.workspace, compilation.stdout.decode())
+
+if __name__ == '__main__':
+    unittest.main()
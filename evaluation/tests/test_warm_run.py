@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import unittest
+from evaluation_lib.build_cache import jar_path
+from evaluation_lib.compile import compileModel, checkCompiled
+from evaluation_lib.warm_run import evaluateWarm
+from evaluation_lib.workspace import createWorkspace, removeWorkspace
+
+# Run from the evaluation folder with
+#   python3 -m unittest discover tests
+
+startup_model_file = os.path.join(os.path.dirname(__file__), '..', 'models', 'startup', 'Startup.abs')
+
+@unittest.skipUnless(
+        os.path.exists(jar_path) and all(shutil.which(tool) is not None for tool in ['java', 'erl', 'erlc']),
+        'the SDS-tool has not been built with ./gradlew shadowJar or Erlang is missing'
+    )
+class WarmRunTest(unittest.TestCase):
+    """
+    Runs warm_run.erl against the ABS runtime which the SDS-tool actually
+    bundles, since the driver relies on its entry point runtime:run_mod/5 and
+    on restarting the absmodel application.
+    """
+
+    def setUp(self):
+        self.workspace = createWorkspace('test-warm-run', [startup_model_file])
+        compileModel([os.path.basename(startup_model_file)], working_dir=self.workspace)
+        checkCompiled(self.workspace)
+
+    def tearDown(self):
+        removeWorkspace(self.workspace)
+
+    def test_every_iteration_runs_the_main_block(self):
+        [(measurement, iterations)] = evaluateWarm(1, self.workspace, 'Startup', 3, timeout=300)
+
+        self.assertIsNone(measurement.killed_by)
+        self.assertEqual([iteration['iteration'] for iteration in iterations], [0, 1, 2])
+        for iteration in iterations:
+            self.assertIn('startup', iteration['stdout'])
+            self.assertGreater(iteration['reductions'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import os
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from common_compile_scaling import *
+from evaluation_lib.results_store import resultsPath, loadResults, cellMeans
+
+os.chdir(working_dir)
+
+to_files = True
+
+for dimension in sweeps:
+    print('Viewing {}'.format(dimension))
+    results = loadResults(resultsPath(cache_dir, dimension))
+    print('Loaded results')
+
+    failures = results[results['exit_code'] != 0]['times'].unique()
+    if len(failures) > 0:
+        print('Compilation failed for {} = {}'.format(dimension, ', '.join(map(str, failures))))
+
+    times_frame = pd.concat([cellMeans(results, 'real', ['compile']), cellMeans(results, 'user', ['compile'])], axis=1)
+    times_frame.columns = ['real', 'user']
+    times_frame.index.name = dimension
+    times_fig = {
+            'name': 'CompileTimes',
+            'frame': times_frame,
+            'ylabel': 'compile time [s]',
+            'xlabel': dimension
+        }
+
+    memory_frame = cellMeans(results, 'maximum_rss', ['compile'])
+    memory_frame.columns = ['maximum_rss']
+    memory_frame.index.name = dimension
+    memory_fig = {
+            'name': 'Memory',
+            'frame': memory_frame,
+            'ylabel': 'maximum memory resident set size [KB]',
+            'xlabel': dimension
+        }
+
+    erlang_frame = cellMeans(results, 'erlang_bytes', ['compile'])
+    erlang_frame.columns = ['erlang_bytes']
+    erlang_frame.index.name = dimension
+    erlang_fig = {
+            'name': 'ErlangSize',
+            'frame': erlang_frame,
+            'ylabel': 'size of generated Erlang code [B]',
+            'xlabel': dimension
+        }
+
+    figures = [times_fig, memory_fig, erlang_fig]
+
+    phase_columns = [column for column in results.columns if column.startswith('phase_')]
+    if len(phase_columns) > 0:
+        phases_frame = results.groupby('times')[phase_columns].mean()
+        phases_frame.columns = [column[len('phase_'):].replace('_', ' ') for column in phase_columns]
+        phases_frame.index.name = dimension
+        phases_fig = {
+                'name': 'Phases',
+                'frame': phases_frame,
+                'ylabel': 'phase duration [s]',
+                'xlabel': dimension,
+                'customplot': lambda frame: frame.plot.bar(stacked=True)
+            }
+        figures.append(phases_fig)
+
+    for fig in figures:
+        print('Viewing figure {}'.format(fig['name']))
+
+        if to_files:
+            fig['frame'].to_csv(os.path.join(cache_dir, '{}_{}.csv'.format(dimension, fig['name'])))
+
+        ax = None
+        if 'customplot' in fig:
+            ax = fig['customplot'](fig['frame'])
+        else:
+            ax = fig['frame'].plot.bar()
+
+        ax.set_ylabel(fig['ylabel'])
+        ax.set_xlabel(fig['xlabel'])
+        ax.autoscale()
+
+        if to_files:
+            plt.savefig(os.path.join(cache_dir, '{}_{}.pdf'.format(dimension, fig['name'])))
+        else:
+            plt.show()
+            input()
+
+        plt.close()
@@ -5,52 +5,17 @@ import os
 import re
 import pandas as pd
 from statistics import mean
-from nltk import edit_distance
 from typing import Sequence, NewType, Tuple
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
 from common_consecutive_calls import *
+from evaluation_lib.invocations import parseInvocations, levenshteinFrame
+from evaluation_lib.plot import startupFigures, warmFigures, memoryTimelineFigures, counterFigures, scalingFigures
+from evaluation_lib.results_store import resultsPath, stdoutsPath, loadResults, cellMeans, openStdouts, readStdout
 
 os.chdir(working_dir)
 
-Invocation = NewType('Invocation', Tuple[str, int])
-invocation_regex = re.compile("(?P<method>m\d+)\((?P<iteration>\d+)\)")
-def extractInvocations(stdout: str) -> Sequence[Invocation]:
-    def helper(x):
-        (method, iteration_str) = x
-        return (method, int(iteration_str))
-
-    return list(map(
-            helper,
-            invocation_regex.findall(stdout)
-        ))
-
-def expectedSequentialInvocations(num_iterations: int, num_methods: int):
-    return sum(
-        map(
-            lambda iteration_idx: sum(
-                    map(
-                        lambda method_id: [(genMethod(method_id), iteration_idx)],
-                        range(0, num_methods)
-                    ),
-                    []
-                ),
-            range(0, num_iterations)
-        ),
-        []
-    )
-
-def stripParametersFromInvocations(invocations: Sequence[Tuple[str, int]]) -> Sequence[str]:
-    def helper(invocation):
-        method_name, parameter = invocation
-        return method_name
-
-    return list(map(
-            helper,
-            invocations
-        ))
-
 index_file = open(os.path.join(cache_dir, 'index'), 'rb')
 run_configs = pickle.load(index_file)
 
@@ -58,12 +23,10 @@ to_files = True
 
 for run_config in run_configs:
     print('Viewing {}'.format(run_config['name']))
-    data_frame = pd.read_pickle(os.path.join(cache_dir, '{0}.frame'.format(run_config['name'])))
-    print('Loaded data frame')
+    results = loadResults(resultsPath(cache_dir, run_config['name']))
+    print('Loaded results')
 
-    user_times_frame = data_frame.applymap(
-            lambda x: x['user']
-        )
+    user_times_frame = cellMeans(results, 'user')
     user_times_frame.index.name = 'repetitions'
     user_times_fig = {
             'name': 'UserTimes',
@@ -72,13 +35,9 @@ for run_config in run_configs:
             'xlabel': 'repetitions'
         }
 
-    delta_user_times_frame = pd.DataFrame(
-            data=data_frame.apply(
-                lambda x: ((x['enforcement']['user'] - x['plain']['user']) / x['plain']['user']) * 100,
-                axis=1
-            ),
-            columns=['relative increase']
-        )
+    delta_user_times_frame = (
+            ((user_times_frame['enforcement'] - user_times_frame['plain']) / user_times_frame['plain']) * 100
+        ).to_frame('relative increase')
     delta_user_times_frame.index.name = 'repetitions'
     delta_user_times_fig = {
             'name': 'DeltaUserTimes',
@@ -87,13 +46,9 @@ for run_config in run_configs:
             'xlabel': 'repetitions'
         }
 
-    real_times_frame = data_frame.applymap(
-            lambda x: x['real']
-        )
+    real_times_frame = cellMeans(results, 'real')
 
-    memory_frame = data_frame.applymap(
-            lambda x: x['maximum_rss']
-        )
+    memory_frame = cellMeans(results, 'maximum_rss')
     memory_frame.index.name = 'repetitions'
     memory_fig = {
             'name': 'Memory',
@@ -102,13 +57,9 @@ for run_config in run_configs:
             'xlabel': 'repetitions'
         }
 
-    delta_memory_frame = pd.DataFrame(
-            data=data_frame.apply(
-                lambda x: ((x['enforcement']['maximum_rss'] - x['plain']['maximum_rss']) / x['plain']['maximum_rss']) * 100,
-                axis=1
-            ),
-            columns=['relative increase']
-        )
+    delta_memory_frame = (
+            ((memory_frame['enforcement'] - memory_frame['plain']) / memory_frame['plain']) * 100
+        ).to_frame('relative increase')
     delta_memory_frame.index.name = 'repetitions'
     delta_memory_fig = {
             'name': 'DeltaMemory',
@@ -117,31 +68,20 @@ for run_config in run_configs:
             'xlabel': 'repetitions'
         }
 
-    scheduler_log_frame = pd.DataFrame(
-        data=data_frame.apply(
-                lambda x: [
-                        x['enforcement']['scheduler_log']['delays'],
-                        x['enforcement']['scheduler_log']['scheduler_calls']
-                    ],
-                axis='columns'
-            ).array,
-        columns=['delays', 'calls of scheduler'],
-        index=data_frame.index
-    )
+    scheduler_log_frame = results[results['variant'] == 'scheduler_log'] \
+        .groupby('times')[['delays', 'scheduler_calls']] \
+        .mean() \
+        .rename(columns={'scheduler_calls': 'calls of scheduler'})
+    scheduler_log_frame.index.name = None
     scheduler_log_fig = {
             'name': 'SchedulerLog',
             'frame': scheduler_log_frame,
             'ylabel': '',
             'xlabel': 'repetitions'
         }
-    delta_scheduler_log = pd.DataFrame(
-            data=scheduler_log_frame.apply(
-                lambda x: (x['delays'] / x['calls of scheduler']) * 100,
-                axis=1
-            ).array,
-            columns=['percentage of delays'],
-            index=data_frame.index
-        )
+    delta_scheduler_log = (
+            (scheduler_log_frame['delays'] / scheduler_log_frame['calls of scheduler']) * 100
+        ).to_frame('percentage of delays')
     delta_scheduler_log.index.name = 'repetitions'
     delta_scheduler_log_fig = {
             'name': 'DeltaSchedulerLog',
@@ -150,114 +90,28 @@ for run_config in run_configs:
             'xlabel': 'repetitions'
         }
 
-    data_frame = data_frame.drop([100,300,500,700,900])
-    #levenshtein_sequential_frame = data_frame.applymap(
-    #        lambda x: {
-    #            'levenshtein': mean(
-    #                map(
-    #                    lambda actualInvocations: edit_distance(
-    #                            expectedSequentialInvocations(num_iterations=x['times'],num_methods=run_config['num_methods']),
-    #                            actualInvocations
-    #                        ),
-    #                    map(
-    #                        extractInvocations,
-    #                        x['stdouts']
-    #                    )
-    #                )
-    #            ),
-    #            'length': x['times'] * run_config['num_methods']
-    #        }
-    #    )
-    #levenshtein_sequential_comparison_frame = pd.DataFrame(
-    #    data=levenshtein_sequential_frame.apply(
-    #            lambda row: [
-    #                    row['plain']['levenshtein'],
-    #                    row['enforcement']['levenshtein'],
-    #                    row['plain']['length']
-    #                ],
-    #            axis=1
-    #        ).array,
-    #    columns=['plain', 'enforcement', 'length'],
-    #    index=data_frame.index
-    #)
-
-    #levenshtein_sequential_delta_comparison_frame = pd.DataFrame(
-    #    data=levenshtein_sequential_frame.apply(
-    #            lambda row: (row['plain']['levenshtein'] / row['plain']['length']) * 100,
-    #            axis=1
-    #        ).array,
-    #    columns=['relative edits'],
-    #    index=data_frame.index
-    #)
-
-    levenshtein_frame = data_frame.applymap(
-            lambda x: {
-                'levenshtein_sequential': mean(
-                    map(
-                        lambda actualInvocations: edit_distance(
-                                expectedSequentialInvocations(num_iterations=x['times'],num_methods=run_config['num_methods']),
-                                actualInvocations
-                            ),
-                        map(
-                            extractInvocations,
-                            x['stdouts']
-                        )
-                    )
-                ),
-                'levenshtein_alternating': mean(
-                    map(
-                        lambda actualInvocations: edit_distance(
-                                stripParametersFromInvocations(
-                                    expectedSequentialInvocations(num_iterations=x['times'],num_methods=run_config['num_methods'])
-                                ),
-                                stripParametersFromInvocations(actualInvocations)
-                            ),
-                        map(
-                            extractInvocations,
-                            x['stdouts']
-                        )
-                    )
-                ),
-                'length': x['times'] * run_config['num_methods']
+    # The raw outputs are only needed here, so we load them lazily from the blob store
+    measurements = results[results['variant'].isin(['plain', 'enforcement'])]
+    with openStdouts(stdoutsPath(cache_dir, run_config['name'])) as blobs:
+        invocation_cells = {
+                (times, variant): [
+                        parseInvocations(readStdout(blobs, offset, length))
+                        for offset, length in zip(cell['stdout_offset'], cell['stdout_length'])
+                    ]
+                for (times, variant), cell in measurements.groupby(['times', 'variant'])
             }
-        )
-    levenshtein_comparison_frame = pd.DataFrame(
-        data=levenshtein_frame.apply(
-                lambda row: [
-                        row['plain']['levenshtein_sequential'],
-                        row['plain']['levenshtein_alternating'],
-                        row['enforcement']['levenshtein_sequential'],
-                        row['enforcement']['levenshtein_alternating'],
-                        row['plain']['length']
-                    ],
-                axis=1
-            ).array,
-        columns=['plain sequential', 'plain alternating', 'enforcement sequential', 'enforcement alternating', 'sequence length'],
-        index=data_frame.index
-    )
 
-    levenshtein_delta_comparison_frame = pd.DataFrame(
-        data=levenshtein_frame.apply(
-                lambda row: row['plain']['levenshtein_alternating'] / row['plain']['length'],
-                axis=1
-            ).array,
-        columns=['edits / sequence length'],
-        index=data_frame.index
-    )
+    levenshtein_comparison_frame = levenshteinFrame(invocation_cells, run_config['num_methods'])[
+            ['plain sequential', 'plain alternating', 'enforcement sequential', 'enforcement alternating', 'sequence length']
+        ]
+
+    levenshtein_delta_comparison_frame = (
+            levenshtein_comparison_frame['plain alternating'] / levenshtein_comparison_frame['sequence length']
+        ).to_frame('edits / sequence length')
 
     def levenshtein_adjustment(frame):
-        adjusted_frame = pd.DataFrame(
-                data = frame.apply(
-                    lambda row: [
-                            row['plain sequential'],
-                            row['plain alternating'],
-                            row['sequence length']
-                        ],
-                    axis='columns'
-                ).array,
-                columns=['sequential', 'alternating', 'sequence length'],
-                index=data_frame.index
-            )
+        adjusted_frame = frame[['plain sequential', 'plain alternating', 'sequence length']] \
+            .rename(columns={'plain sequential': 'sequential', 'plain alternating': 'alternating'})
         adjusted_frame.index.name = 'repetitions'
         return adjusted_frame
 
@@ -278,6 +132,36 @@ for run_config in run_configs:
         }
 
     figures = [user_times_fig, delta_user_times_fig, memory_fig, delta_memory_fig, levenshtein_comparison_fig, levenshtein_delta_fig, scheduler_log_fig, delta_scheduler_log_fig]
+
+    figures += startupFigures(results)
+    figures += warmFigures(results)
+    figures += memoryTimelineFigures(results)
+    figures += counterFigures(results)
+
+    if 'counter_context-switches' in results.columns:
+        # Whether the scheduler of the enforcement causes additional switches
+        # between OS threads
+        context_switches_frame = cellMeans(results, 'counter_context-switches')
+        context_switches_per_call_frame = pd.concat(
+                [
+                    context_switches_frame['enforcement'] / scheduler_log_frame['calls of scheduler'],
+                    (context_switches_frame['enforcement'] - context_switches_frame['plain']) / scheduler_log_frame['calls of scheduler']
+                ],
+                axis=1,
+                keys=['context switches', 'additional context switches']
+            )
+        context_switches_per_call_frame.index.name = 'repetitions'
+        context_switches_per_call_fig = {
+                'name': 'ContextSwitchesPerSchedulerCall',
+                'frame': context_switches_per_call_frame,
+                'ylabel': 'context switches per scheduler call',
+                'xlabel': 'repetitions'
+            }
+
+        figures.append(context_switches_per_call_fig)
+
+    figures += scalingFigures(results)
+
     for fig in figures:
         print('Viewing figure {}'.format(fig['name']))
 
@@ -11,17 +11,17 @@ import matplotlib.pyplot as plt
 import matplotlib as mpl
 
 from common_notification_service_perf import *
+from evaluation_lib.plot import startupFigures, warmFigures, memoryTimelineFigures, counterFigures, scalingFigures
+from evaluation_lib.results_store import resultsPath, loadResults, cellMeans
 
 os.chdir(working_dir)
 
 to_files = True
 
-data_frame = pd.read_pickle(os.path.join(cache_dir, 'NotificationService.frame'))
-print('Loaded data frame')
+results = loadResults(resultsPath(cache_dir, 'NotificationService'))
+print('Loaded results')
 
-user_times_frame = data_frame.applymap(
-        lambda x: x['user']
-    )
+user_times_frame = cellMeans(results, 'user')
 user_times_frame.index.name = 'repetitions'
 user_times_fig = {
         'name': 'UserTimes',
@@ -30,13 +30,9 @@ user_times_fig = {
         'xlabel': 'repetitions'
     }
 
-delta_user_times_frame = pd.DataFrame(
-        data=data_frame.apply(
-            lambda x: ((x['enforcement']['user'] - x['plain']['user']) / x['plain']['user']) * 100,
-            axis=1
-        ),
-        columns=['relative increase']
-    )
+delta_user_times_frame = (
+        ((user_times_frame['enforcement'] - user_times_frame['plain']) / user_times_frame['plain']) * 100
+    ).to_frame('relative increase')
 delta_user_times_frame.index.name = 'repetitions'
 delta_user_times_fig = {
         'name': 'DeltaUserTimes',
@@ -45,9 +41,7 @@ delta_user_times_fig = {
         'xlabel': 'repetitions'
     }
 
-memory_frame = data_frame.applymap(
-        lambda x: x['maximum_rss']
-    )
+memory_frame = cellMeans(results, 'maximum_rss')
 memory_frame.index.name = 'repetitions'
 memory_fig = {
         'name': 'Memory',
@@ -56,13 +50,9 @@ memory_fig = {
         'xlabel': 'repetitions'
     }
 
-delta_memory_frame = pd.DataFrame(
-        data=data_frame.apply(
-            lambda x: ((x['enforcement']['maximum_rss'] - x['plain']['maximum_rss']) / x['plain']['maximum_rss']) * 100,
-            axis=1
-        ),
-        columns=['relative increase']
-    )
+delta_memory_frame = (
+        ((memory_frame['enforcement'] - memory_frame['plain']) / memory_frame['plain']) * 100
+    ).to_frame('relative increase')
 delta_memory_frame.index.name = 'repetitions'
 delta_memory_fig = {
         'name': 'DeltaMemory',
@@ -72,6 +62,13 @@ delta_memory_fig = {
     }
 
 figures = [user_times_fig, delta_user_times_fig, memory_fig, delta_memory_fig]
+
+figures += startupFigures(results)
+figures += warmFigures(results)
+figures += memoryTimelineFigures(results)
+figures += counterFigures(results)
+figures += scalingFigures(results)
+
 for fig in figures:
     print('Viewing figure {}'.format(fig['name']))
 
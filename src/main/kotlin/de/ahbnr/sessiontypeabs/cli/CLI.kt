@@ -6,6 +6,7 @@ import picocli.CommandLine
     name = "SessionTypeABS",
     subcommands = [
         Compile::class,
+        CompileServer::class,
         PrintGlobalTypes::class,
         PrintLocalTypes::class,
         PrintCondensedLocalTypes::class,
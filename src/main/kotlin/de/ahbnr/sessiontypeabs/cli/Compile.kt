@@ -1,10 +1,12 @@
 package de.ahbnr.sessiontypeabs.cli
 
 import de.ahbnr.sessiontypeabs.compiler.CompilerConfig
+import de.ahbnr.sessiontypeabs.compiler.PhaseTimings
 import de.ahbnr.sessiontypeabs.compiler.compile
 import de.ahbnr.sessiontypeabs.dynamicenforcement.EnforcementConfig
 import de.ahbnr.sessiontypeabs.staticverification.VerificationConfig
 import picocli.CommandLine.*
+import java.io.File
 
 @Command(
     name = "compile",
@@ -52,29 +54,41 @@ class Compile : Runnable {
 
     override fun run() {
         try {
-            extractUnknownFiles(files.asIterable())
-                .forEach {
-                    println("WARNING: Not considering file $it, since it neither has the .abs or .st file extension")
-                }
-
-            val absSourceFiles = extractAbsSourceFiles(files.asIterable())
-            val typeSourceFiles = extractTypeSourceFiles(files.asIterable())
-
-            compile(
-                absSourceFileNames = absSourceFiles,
-                typeSourceFileNames = typeSourceFiles,
-                verificationConfig = VerificationConfig(noChecks = noStaticChecks),
-                enforcementConfig = EnforcementConfig(
-                    noEnforcement = noEnforcement,
-                    logSchedulerCalls = logSchedulerCalls.toSet(),
-                    logActivationDelay = logActivationDelay.toSet()
-                ),
-                compilerConfig = CompilerConfig(verboseErlangCompilation=verboseErlangCompilation)
-            )
+            compileIn(File("."), PhaseTimings())
         }
 
         catch (exception: Exception) {
             handleException(exception)
         }
     }
+
+    /**
+     * Compiles the given files, resolving their paths relative to [workingDirectory]
+     * and placing the generated Erlang code in its `gen/erl` subdirectory.
+     */
+    fun compileIn(workingDirectory: File, timings: PhaseTimings) {
+        extractUnknownFiles(files.asIterable())
+            .forEach {
+                println("WARNING: Not considering file $it, since it neither has the .abs or .st file extension")
+            }
+
+        val resolve = { fileName: String -> workingDirectory.toPath().resolve(fileName).normalize().toString() }
+
+        val absSourceFiles = extractAbsSourceFiles(files.asIterable()).map(resolve)
+        val typeSourceFiles = extractTypeSourceFiles(files.asIterable()).map(resolve)
+
+        compile(
+            absSourceFileNames = absSourceFiles,
+            typeSourceFileNames = typeSourceFiles,
+            verificationConfig = VerificationConfig(noChecks = noStaticChecks),
+            enforcementConfig = EnforcementConfig(
+                noEnforcement = noEnforcement,
+                logSchedulerCalls = logSchedulerCalls.toSet(),
+                logActivationDelay = logActivationDelay.toSet()
+            ),
+            compilerConfig = CompilerConfig(verboseErlangCompilation=verboseErlangCompilation),
+            timings = timings,
+            outputDirectory = File(workingDirectory, "gen/erl/")
+        )
+    }
 }
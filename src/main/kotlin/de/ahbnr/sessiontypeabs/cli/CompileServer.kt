@@ -0,0 +1,81 @@
+package de.ahbnr.sessiontypeabs.cli
+
+import de.ahbnr.sessiontypeabs.compiler.PhaseTimings
+import picocli.CommandLine
+import picocli.CommandLine.*
+import java.io.ByteArrayOutputStream
+import java.io.File
+import java.io.PrintStream
+import java.net.InetAddress
+import java.net.ServerSocket
+import java.net.Socket
+
+@Command(
+    name = "compileServer",
+    description = arrayOf("Keeps the compiler loaded and serves compilation requests on a local socket, avoiding the JVM startup for every compilation.")
+)
+class CompileServer : Runnable {
+    @Option(
+        names = ["--port"],
+        description = arrayOf("Port on the loopback interface to listen on.")
+    )
+    private var port: Int = 7878
+
+    /**
+     * Protocol: A client connects and sends the working directory of the compilation followed by the arguments of the
+     * compile command, one per line, terminated by an empty line.
+     * The server answers with "ok" or "error", one line "phase NAME MILLISECONDS" per compilation phase, a line
+     * "output" and then everything the compiler printed, before closing the connection.
+     *
+     * Requests are handled one after another, since the ABS compiler is not thread safe.
+     */
+    override fun run() {
+        ServerSocket(port, 50, InetAddress.getLoopbackAddress()).use { server ->
+            println("Compile server listening on port ${server.localPort}")
+
+            while (true) {
+                server.accept().use(::handleRequest)
+            }
+        }
+    }
+
+    private fun handleRequest(socket: Socket) {
+        val reader = socket.getInputStream().bufferedReader()
+        val workingDirectory = File(reader.readLine() ?: return)
+        val args = generateSequence { reader.readLine() }
+            .takeWhile { it.isNotEmpty() }
+            .toList()
+
+        val timings = PhaseTimings()
+        val output = ByteArrayOutputStream()
+        val stdout = System.out
+        val success = try {
+            System.setOut(PrintStream(output, true))
+
+            CommandLine
+                .populateCommand(Compile(), *args.toTypedArray())
+                .compileIn(workingDirectory, timings)
+
+            true
+        }
+
+        catch (exception: Exception) {
+            handleException(exception)
+
+            false
+        }
+
+        finally {
+            System.setOut(stdout)
+        }
+
+        val writer = socket.getOutputStream().bufferedWriter()
+        writer.write(if (success) "ok\n" else "error\n")
+        timings.millis.forEach { (phase, millis) ->
+            writer.write("phase $phase $millis\n")
+        }
+        writer.write("output\n")
+        writer.write(output.toString())
+        writer.flush()
+    }
+}
@@ -2,24 +2,32 @@ package de.ahbnr.sessiontypeabs.compiler
 
 import de.ahbnr.sessiontypeabs.dynamicenforcement.EnforcementConfig
 import de.ahbnr.sessiontypeabs.staticverification.VerificationConfig
+import java.io.File
 
 /**
  * Modifies an ABS model, such that it complies with a given set of Global Session Types at runtime and then compiles them
  * to Erlang.
+ *
+ * The duration of each compilation phase is recorded in [timings].
  */
 fun compile(
     absSourceFileNames: Iterable<String>,
     typeSourceFileNames: Iterable<String>,
     verificationConfig: VerificationConfig = VerificationConfig(),
     enforcementConfig: EnforcementConfig = EnforcementConfig(),
-    compilerConfig: CompilerConfig = CompilerConfig()
+    compilerConfig: CompilerConfig = CompilerConfig(),
+    timings: PhaseTimings = PhaseTimings(),
+    outputDirectory: File = File("gen/erl/")
 ): ModelBuild {
-    val model = parseModel(absSourceFileNames)
+    val model = timings.measure("parse") { parseModel(absSourceFileNames) }
+    val globalTypes = timings.measure("parse") { parseTypes(typeSourceFileNames) }
 
-    val typeBuilds = buildTypes(typeSourceFileNames, model)
-    val modelBuild = buildModel(model, typeBuilds, verificationConfig, enforcementConfig)
+    val typeBuilds = timings.measure("projection") { buildTypes(globalTypes, model) }
+    val modelBuild = buildModel(model, typeBuilds, verificationConfig, enforcementConfig, timings)
 
-    modelToErlang(modelBuild.model)
+    timings.measure("erlang codegen") {
+        modelToErlang(modelBuild.model, compilerConfig, outputDirectory)
+    }
 
     return modelBuild
 }
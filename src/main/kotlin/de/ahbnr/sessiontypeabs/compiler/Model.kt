@@ -61,44 +61,49 @@ fun buildModel(
     model: Model,
     typeBuilds: TypeBuildCollection,
     verificationConfig: VerificationConfig = VerificationConfig(),
-    enforcementConfig: EnforcementConfig = EnforcementConfig()
+    enforcementConfig: EnforcementConfig = EnforcementConfig(),
+    timings: PhaseTimings = PhaseTimings()
 ): ModelBuild {
-    checkAndRewriteModel(model)
-    model.doFullTraversal() // make sure we triggered all rewrites
+    timings.measure("static checks") {
+        checkAndRewriteModel(model)
+        model.doFullTraversal() // make sure we triggered all rewrites
 
-    if (!verificationConfig.noChecks) {
-        // static verification
-        for (typeBuild in typeBuilds.typeBuilds) {
-            checkModel(model, typeBuild, verificationConfig)
+        if (!verificationConfig.noChecks) {
+            // static verification
+            for (typeBuild in typeBuilds.typeBuilds) {
+                checkModel(model, typeBuild, verificationConfig)
+            }
         }
     }
 
-    // Modify ABS model, if configuration doesnt forbid it
-    val modLog = if (!enforcementConfig.noEnforcement) {
-        val modLog = applyTypesToModel(
-            model,
-            typeBuilds.mergedCondensedTypes(),
-            enforcementConfig
-        )
+    return timings.measure("enforcement") {
+        // Modify ABS model, if configuration doesnt forbid it
+        val modLog = if (!enforcementConfig.noEnforcement) {
+            val modLog = applyTypesToModel(
+                model,
+                typeBuilds.mergedCondensedTypes(),
+                enforcementConfig
+            )
 
-        // Check whether all participants could be modified (none was missing in the model)
-        checkForMissingParticipants(typeBuilds.mergedGlobalTypes(), modLog)
+            // Check whether all participants could be modified (none was missing in the model)
+            checkForMissingParticipants(typeBuilds.mergedGlobalTypes(), modLog)
 
-        modLog
-    }
+            modLog
+        }
 
-    else {
-        ModificationLog()
-    }
+        else {
+            ModificationLog()
+        }
 
-    val modifiedBeforeRewrite = model.treeCopyNoTransform()
-    checkAndRewriteModel(model)
+        val modifiedBeforeRewrite = model.treeCopyNoTransform()
+        checkAndRewriteModel(model)
 
-    return ModelBuild(
-        model = model,
-        modifiedModelBeforeRewrite = modifiedBeforeRewrite, // TODO: This one is only useful for printing the modified model, but a huge investment (requires copying the whole model). Maybe this can be optimized.
-        modificationLog = modLog
-    )
+        ModelBuild(
+            model = model,
+            modifiedModelBeforeRewrite = modifiedBeforeRewrite, // TODO: This one is only useful for printing the modified model, but a huge investment (requires copying the whole model). Maybe this can be optimized.
+            modificationLog = modLog
+        )
+    }
 }
 
 data class ModelBuild(
@@ -149,11 +154,15 @@ fun handleModelErrors(model: Model) {
 /**
  * Compiles ABS model to Erlang
  */
-fun modelToErlang(model: Model, compilerConfig: CompilerConfig = CompilerConfig()) =
+fun modelToErlang(
+    model: Model,
+    compilerConfig: CompilerConfig = CompilerConfig(),
+    outputDirectory: File = File("gen/erl/")
+) =
     ErlangBackend()
         .compile(
             model,
-            File("gen/erl/"),
+            outputDirectory,
             if (compilerConfig.verboseErlangCompilation) {
                 EnumSet.of(ErlangBackend.CompileOptions.VERBOSE)
             }
@@ -0,0 +1,24 @@
+package de.ahbnr.sessiontypeabs.compiler
+
+/**
+ * Records how much time the phases of a compilation take.
+ * Phases are kept in the order in which they have been executed first.
+ */
+class PhaseTimings {
+    private val durations = LinkedHashMap<String, Long>()
+
+    val millis: Map<String, Long>
+        get() = durations
+
+    fun <T> measure(phase: String, block: () -> T): T {
+        val start = System.nanoTime()
+
+        try {
+            return block()
+        }
+
+        finally {
+            durations[phase] = (durations[phase] ?: 0) + (System.nanoTime() - start) / 1_000_000
+        }
+    }
+}